@@ -0,0 +1,56 @@
+"""
+Benchmark running a small sample test suite with an app (and database
+schema) created per test, against a session-scoped app with each test's
+changes rolled back by transactional_session (ie, the api_app and
+db_transaction pytest fixtures).
+
+Usage (from the project root): python benchmarks/db_transaction.py [num_tests]
+"""
+import sys
+import timeit
+
+from flask_sqlalchemy_bundle import db
+
+from flask_api_bundle.pytest import (
+    _api_test_client, enable_sqlite_savepoints, transactional_session)
+from tests.conftest import create_app
+
+
+def sample_test(client):
+    assert client.post('/api/users', data={'name': 'a'}).status_code == 201
+    assert len(client.get('/api/users').json) == 1
+
+
+def app_per_test():
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        with _api_test_client(app) as client:
+            sample_test(client)
+        db.session.remove()
+        db.drop_all()
+
+
+def main(num_tests=50):
+    per_test_app = timeit.timeit(app_per_test, number=num_tests)
+
+    # setting up the session-scoped app is counted too
+    start = timeit.default_timer()
+    app = create_app()
+    with app.app_context():
+        enable_sqlite_savepoints(db.engine)
+        db.create_all()
+        for _ in range(num_tests):
+            with transactional_session():
+                with _api_test_client(app) as client:
+                    sample_test(client)
+    transactional = timeit.default_timer() - start
+
+    print(f'{num_tests} sample tests:')
+    print(f'  app per test:   {per_test_app:.3f}s')
+    print(f'  db_transaction: {transactional:.3f}s '
+          f'({per_test_app / transactional:.1f}x faster)')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,82 @@
+"""
+Benchmark ModelSerializer loads of small partial (patch) payloads against a
+wide model, comparing the precomputed validation plan against the previous
+behavior of passing the whole request dict to Model.validate.
+
+Usage: python benchmarks/patch_load.py [num_columns] [num_loads]
+"""
+import sys
+import timeit
+
+from flask_sqlalchemy_bundle import db
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from flask_api_bundle import ma
+
+
+def make_wide_model(num_columns):
+    attrs = {'__tablename__': 'wide_model',
+             'id': db.Column(db.Integer, primary_key=True)}
+    for i in range(num_columns):
+        # alternate between nullable and not, so the model gets validators
+        attrs[f'column_{i}'] = db.Column(db.String(64), nullable=bool(i % 2))
+    return type('WideModel', (db.Model,), attrs)
+
+
+def make_serializers(model):
+    meta = type('Meta', (), {'model': model})
+    serializer_cls = type('WideModelSerializer', (ma.ModelSerializer,),
+                          {'Meta': meta})
+
+    class LegacySerializer(serializer_cls):
+        def _do_load(self, data, many=None, partial=None, postprocess=True):
+            result, errors = super(ma.ModelSerializer, self)._do_load(
+                data or {}, many, partial, postprocess)
+            if not isinstance(data, dict):
+                return result, errors
+
+            try:
+                self.Meta.model.validate(**data)
+            except db.ValidationErrors as e:
+                for column, col_errors in e.errors.items():
+                    for error in col_errors:
+                        if column in errors:
+                            errors[column].append(error)
+                        else:
+                            errors[column] = [error]
+            return result, errors
+
+    return serializer_cls, LegacySerializer
+
+
+def main(num_columns=100, num_loads=5000):
+    model = make_wide_model(num_columns)
+    engine = create_engine('sqlite://')
+    model.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+
+    instance = model(**{f'column_{i}': 'x' for i in range(num_columns)})
+    session.add(instance)
+    session.commit()
+
+    payloads = [{'column1': 'y'}, {'column1': 'y', 'column2': 'z'},
+                {'column_10': 'y'}]
+
+    print(f'{num_loads} partial loads x {len(payloads)} payloads, '
+          f'{num_columns} columns')
+    for label, serializer_cls in zip(['plan', 'legacy'],
+                                     make_serializers(model)):
+        serializer = serializer_cls(session=session)
+
+        def run():
+            for payload in payloads:
+                serializer.load(payload, instance=instance, partial=True)
+
+        elapsed = timeit.timeit(run, number=num_loads)
+        per_load = elapsed / (num_loads * len(payloads)) * 1e6
+        print(f'{label:>8}: {elapsed:.3f}s ({per_load:.1f}us per load)')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -16,7 +16,7 @@ from flask import Flask
 from flask_unchained import Bundle
 from speaklater import _LazyString
 
-from .extensions import ma
+from .extensions import ma, openapi
 from .model_resource import ModelResource
 
 
@@ -56,3 +56,7 @@ class FlaskApiBundle(Bundle):
                 return super().default(obj)
 
         app.json_encoder = JSONEncoder
+
+        if app.config.get('API_BATCH_URL'):
+            from .batch import register_batch_view
+            register_batch_view(app)
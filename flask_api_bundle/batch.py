@@ -0,0 +1,217 @@
+import json
+
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, current_app, g, jsonify, request
+from flask_sqlalchemy_bundle import db
+from http import HTTPStatus
+from werkzeug.test import EnvironBuilder
+
+
+BATCH_TRANSACTION_ATTR = '_api_batch_transaction'
+LAST_WRITE_ATTR = '_api_last_write'  # set by ReadReplicas.record_write
+BATCH_METHODS = {'GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE'}
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+def in_batch_transaction():
+    """
+    Check if we're a write sub-request of a batch request whose writes share a
+    single transaction (in which case the batch view takes care of committing)
+    """
+    return g.get(BATCH_TRANSACTION_ATTR, False)
+
+
+class BatchView:
+    """
+    View to multiplex many API calls into a single HTTP round trip. It accepts
+    a JSON list of sub-requests (or an object with the list under the
+    ``requests`` key), eg::
+
+        [{"method": "GET", "path": "/api/users/1"},
+         {"method": "PATCH", "path": "/api/users/1", "body": {"name": "foo"}}]
+
+    Each sub-request gets dispatched internally through the normal routing,
+    and a list of ``{"status": int, "body": ...}`` results (in the same order
+    as the sub-requests) is returned. Consecutive read-only sub-requests run
+    concurrently on a bounded thread pool, while writes run one at a time in
+    the order given. If the ``transaction`` key is set in the request object,
+    all of the writes share a single transaction, and a failing write rolls
+    back all of them.
+    """
+    def __init__(self, app: Flask):
+        self.app = app
+        self.max_requests = app.config.get('API_BATCH_MAX_REQUESTS')
+        self.forwarded_headers = {
+            header.lower()
+            for header in app.config.get('API_BATCH_FORWARDED_HEADERS') or []}
+        self.executor = ThreadPoolExecutor(
+            app.config.get('API_BATCH_MAX_WORKERS'))
+
+    def __call__(self):
+        data = request.get_json()
+        transaction = False
+        if isinstance(data, dict):
+            transaction = bool(data.get('transaction'))
+            data = data.get('requests')
+
+        errors = self.validate(data)
+        if errors:
+            return jsonify(errors=errors), HTTPStatus.BAD_REQUEST
+
+        environ_base = dict(base_url=request.host_url, headers={
+            k: v for k, v in request.headers.items()
+            if k.lower() in self.forwarded_headers})
+        if transaction:
+            return self.make_response(
+                self.dispatch_transaction(data, environ_base))
+
+        results = [None] * len(data)
+        reads = []
+        for i, sub_request in enumerate(data):
+            if sub_request['method'] in SAFE_METHODS:
+                reads.append(i)
+                continue
+            self.dispatch_reads(data, reads, results, environ_base)
+            reads = []
+            results[i] = self.dispatch(sub_request, environ_base)
+        self.dispatch_reads(data, reads, results, environ_base)
+        return self.make_response(results)
+
+    def make_response(self, results):
+        response = jsonify(results)
+        # sub-responses get thrown away, so pass the read-your-writes cookie
+        # (if any of the writes set it) on to the client
+        replicas = current_app.extensions.get('read_replicas')
+        if replicas and replicas.enabled:
+            replicas.set_cookie(response)
+        return response
+
+    def validate(self, data):
+        if not isinstance(data, list) or not data:
+            return {'requests': ['Requests must be a non-empty list.']}
+        elif self.max_requests and len(data) > self.max_requests:
+            return {'requests': [f'Too many requests (the maximum is '
+                                 f'{self.max_requests}).']}
+
+        errors = {}
+        batch_path = request.path
+        for i, sub_request in enumerate(data):
+            if not isinstance(sub_request, dict):
+                errors[i] = ['Request must be an object.']
+                continue
+
+            sub_request['method'] = str(sub_request.get('method', 'GET')).upper()
+            path = sub_request.get('path')
+            if sub_request['method'] not in BATCH_METHODS:
+                errors[i] = [f'Method {sub_request["method"]} not allowed.']
+            elif not isinstance(path, str) or not path.startswith('/'):
+                errors[i] = ['Path is required.']
+            elif path.split('?')[0] == batch_path:
+                errors[i] = ['Batch requests may not be nested.']
+        return errors
+
+    def dispatch_transaction(self, data, environ_base):
+        """
+        Dispatch all of the sub-requests sequentially, sharing a single
+        transaction. (Reads also run in the current thread, so that they can
+        see the uncommitted changes from earlier writes.)
+        """
+        results = []
+        failed = False
+        setattr(g, BATCH_TRANSACTION_ATTR, True)
+        try:
+            for sub_request in data:
+                is_write = sub_request['method'] not in SAFE_METHODS
+                if failed and is_write:
+                    results.append(self.failed_dependency())
+                    continue
+
+                result = self.dispatch(sub_request, environ_base)
+                results.append(result)
+                # a server error may have left the session unusable, so treat
+                # it as a failure even for reads
+                if (is_write and result['status'] >= HTTPStatus.BAD_REQUEST
+                        or result['status'] >= HTTPStatus.INTERNAL_SERVER_ERROR):
+                    # roll back (and mark as failed) all of the earlier writes
+                    failed = True
+                    db.session.rollback()
+                    for i, prev in enumerate(data[:len(results) - 1]):
+                        if prev['method'] not in SAFE_METHODS:
+                            results[i] = self.failed_dependency()
+
+            if not failed:
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            setattr(g, BATCH_TRANSACTION_ATTR, False)
+        return results
+
+    def dispatch_reads(self, data, indexes, results, environ_base):
+        if len(indexes) == 1:
+            i = indexes[0]
+            results[i] = self.dispatch(data[i], environ_base)
+            return
+
+        last_write = g.get(LAST_WRITE_ATTR)
+        futures = [(i, self.executor.submit(self.dispatch_in_app_context,
+                                            data[i], environ_base, last_write))
+                   for i in indexes]
+        for i, future in futures:
+            results[i] = future.result()
+
+    def dispatch_in_app_context(self, sub_request, environ_base,
+                                last_write=None):
+        with self.app.app_context():
+            # so that reads after earlier writes in the batch don't go to a
+            # (possibly lagging) read replica
+            if last_write is not None:
+                setattr(g, LAST_WRITE_ATTR, last_write)
+            return self.dispatch(sub_request, environ_base)
+
+    def dispatch(self, sub_request, environ_base):
+        kwargs = dict(environ_base, method=sub_request['method'])
+        if sub_request.get('body') is not None:
+            kwargs['data'] = json.dumps(sub_request['body'])
+            kwargs['content_type'] = 'application/json'
+
+        builder = EnvironBuilder(sub_request['path'], **kwargs)
+        try:
+            with self.app.request_context(builder.get_environ()):
+                try:
+                    response = self.app.full_dispatch_request()
+                except Exception as e:
+                    response = self.app.handle_exception(e)
+        except Exception:
+            self.rollback_failed()
+            raise
+        finally:
+            builder.close()
+
+        if response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            self.rollback_failed()
+
+        body = response.get_data(as_text=True)
+        if body and response.mimetype == 'application/json':
+            body = json.loads(body)
+        return {'status': response.status_code, 'body': body}
+
+    def rollback_failed(self):
+        """
+        Roll back the session after a sub-request failed with a server error
+        (eg during a flush or commit), so that later sub-requests sharing it
+        can still use it. (Transactional batches handle this themselves.)
+        """
+        if not in_batch_transaction():
+            db.session.rollback()
+
+    def failed_dependency(self):
+        return {'status': int(HTTPStatus.FAILED_DEPENDENCY),
+                'body': {'errors': {'transaction': [
+                    'Rolled back because another write failed.']}}}
+
+
+def register_batch_view(app: Flask):
+    app.add_url_rule(app.config.get('API_BATCH_URL'), 'api_batch',
+                     BatchView(app), methods=['POST'])
@@ -0,0 +1,23 @@
+from flask_unchained.cli import cli, click
+
+from .extensions import openapi
+
+
+@cli.group()
+def api():
+    """
+    API commands.
+    """
+
+
+@api.command('openapi')
+@click.argument('path', default='openapi.json')
+@click.option('--indent', type=int, default=2,
+              help='The number of spaces to indent the JSON with.')
+def write_openapi(path, indent):
+    """
+    Write the OpenAPI document to a file.
+    """
+    with open(path, 'w') as f:
+        f.write(openapi.to_json(indent=indent))
+    click.echo(f'Wrote OpenAPI document to {path}')
@@ -0,0 +1,135 @@
+class BaseConfig:
+    API_BATCH_URL = None
+    """
+    The URL to register the batch view at, eg ``'/api/batch'``. Set to ``None``
+    (the default) to disable the batch endpoint.
+    """
+
+    API_BATCH_MAX_REQUESTS = 50
+    """
+    The maximum number of sub-requests allowed in a single batch request.
+    """
+
+    API_BATCH_MAX_WORKERS = 4
+    """
+    The number of threads used to concurrently dispatch read-only sub-requests.
+    """
+
+    API_BATCH_FORWARDED_HEADERS = ['Accept-Language', 'Authentication-Token',
+                                   'Authorization', 'Cookie']
+    """
+    The headers of the batch request that get passed through to each of its
+    sub-requests (eg so that they're authenticated as the same user).
+    """
+
+    API_OPENAPI_URL = None
+    """
+    The URL to serve the OpenAPI document at, eg ``'/api/openapi.json'``. Set
+    to ``None`` (the default) to not serve it.
+    """
+
+    API_OPENAPI_TITLE = None
+    """
+    The title of the OpenAPI document. Defaults to the name of the app.
+    """
+
+    API_OPENAPI_VERSION = '1.0.0'
+    """
+    The version of the API, as listed in the OpenAPI document.
+    """
+
+    API_VALIDATE_REQUESTS = False
+    """
+    Whether or not to run the fast request body validation (compiled from the
+    OpenAPI schemas) before loading request data with marshmallow.
+    """
+
+    API_READ_REPLICA_BINDS = []
+    """
+    A list of ``SQLALCHEMY_BINDS`` keys to use as read replicas. When set, the
+    list and get queries of model resources (that haven't opted out by setting
+    ``use_read_replicas = False``) go to the replicas, round-robin.
+    """
+
+    API_READ_YOUR_WRITES_SECONDS = 5
+    """
+    The number of seconds after a client writes that its reads should stay on
+    the primary database. Set to ``None`` to always read from the replicas.
+    """
+
+    API_READ_YOUR_WRITES_COOKIE = 'api_last_write'
+    """
+    The name of the cookie used to track when a client last wrote.
+    """
+
+    API_WRITE_BEHIND_QUEUE_SIZE = 10000
+    """
+    The maximum number of instances waiting to be saved by the write-behind
+    worker (for model resources with ``write_behind = True``).
+    """
+
+    API_WRITE_BEHIND_BATCH_SIZE = 500
+    """
+    The maximum number of queued instances to save per transaction.
+    """
+
+    API_WRITE_BEHIND_PUT_TIMEOUT = 0
+    """
+    The number of seconds a create request waits for room in a full queue
+    before responding with an HTTP 503 status code.
+    """
+
+    API_WRITE_BEHIND_MAX_STATUSES = 100000
+    """
+    The maximum number of write-behind statuses to keep track of (the oldest
+    get dropped first).
+    """
+
+    API_WRITE_BEHIND_STATUS_URL = '/api/write-behind/<handle>'
+    """
+    The URL to serve write-behind statuses at (when any model resources have
+    ``write_behind = True``). Set to ``None`` to not serve them.
+    """
+
+    API_IDEMPOTENCY_HEADER = 'Idempotency-Key'
+    """
+    The request header clients send idempotency keys with (on the create, put,
+    patch and delete endpoints of model resources).
+    """
+
+    API_IDEMPOTENCY_TTL = 24 * 60 * 60
+    """
+    The number of seconds to keep responses for idempotency keys.
+    """
+
+    API_IDEMPOTENCY_MAX_KEYS = 10000
+    """
+    The maximum number of responses the default (in-process) idempotency store
+    keeps (the oldest get evicted first).
+    """
+
+    API_IDEMPOTENCY_STORE = None
+    """
+    A callable that gets passed the app and returns the
+    :class:`~flask_api_bundle.idempotency.IdempotencyStore` to use. Defaults to
+    an in-process store.
+    """
+
+    API_IDEMPOTENCY_WAIT_TIMEOUT = 30
+    """
+    The number of seconds a duplicate request waits for the in-flight request
+    with the same idempotency key to finish, before responding with an HTTP 409
+    status code.
+    """
+
+    API_POOL_METRICS = False
+    """
+    Whether or not to keep track of how long requests wait to check out
+    connections from the database connection pools.
+    """
+
+    API_POOL_METRICS_URL = None
+    """
+    The URL to serve the connection pool metrics at, eg
+    ``'/api/pool-metrics'``. Set to ``None`` (the default) to not serve them.
+    """
@@ -1,19 +1,69 @@
 from functools import wraps
 from http import HTTPStatus
 
-from flask import abort, request
+from flask import abort, current_app, request
+from flask_sqlalchemy_bundle import db
+from flask_unchained.string_utils import snake_case
 
+from .extensions import replicas
+from .openapi import validate_request_body
 
-def list_loader(*decorator_args, model):
+
+def list_loader(*decorator_args, model, replica=False, exporter=None,
+                export_query=None):
     """
     Decorator to automatically query the database for all records of a model.
 
     :param model: The model class to query
+    :param replica: Whether or not the query may go to a read replica
+    :param exporter: An optional :class:`~flask_api_bundle.export.ModelExporter`
+                     to stream the records with (bypassing the view function)
+                     when the request asks for one of its export formats
+    :param export_query: An optional callable returning the query for the
+                         exporter to stream rows from (defaults to all of
+                         them)
     """
     def wrapped(fn):
         @wraps(fn)
         def decorated(*args, **kwargs):
-            return fn(model.query.all())
+            fmt = exporter and exporter.get_format()
+            if fmt:
+                bind = replica and replicas.get_bind(model) or db.get_engine(
+                    current_app, bind=getattr(model, '__bind_key__', None))
+                return exporter.response(
+                    fmt, bind, export_query and export_query())
+
+            query = replicas.query(model) if replica else model.query
+            return fn(query.all())
+        return decorated
+
+    if decorator_args and callable(decorator_args[0]):
+        return wrapped(decorator_args[0])
+    return wrapped
+
+
+def member_loader(*decorator_args, model, param_name, kw_name):
+    """
+    Decorator to automatically query the database (or a read replica, if
+    possible) for a model instance by a url parameter. Works like
+    :func:`flask_sqlalchemy_bundle.param_converter`, and aborts with an HTTP
+    404 status code if the instance isn't found.
+
+    :param model: The model class to query
+    :param param_name: The url parameter name to filter by
+    :param kw_name: The keyword argument name to pass the instance to the view
+    """
+    filter_by = param_name.replace(f'{snake_case(model.__name__)}_', '')
+
+    def wrapped(fn):
+        @wraps(fn)
+        def decorated(*args, **kwargs):
+            instance = replicas.query(model).filter_by(
+                **{filter_by: kwargs.pop(param_name)}).first()
+            if not instance:
+                abort(HTTPStatus.NOT_FOUND)
+            kwargs[kw_name] = instance
+            return fn(*args, **kwargs)
         return decorated
 
     if decorator_args and callable(decorator_args[0]):
@@ -31,9 +81,13 @@ def patch_loader(*decorator_args, serializer):
     def wrapped(fn):
         @wraps(fn)
         def decorated(*args, **kwargs):
-            result = serializer.load(request.get_json(),
-                                     instance=kwargs.pop('instance'),
-                                     partial=True)
+            data = request.get_json()
+            instance = kwargs.pop('instance')
+            errors = validate_request_body(serializer, data, partial=True)
+            if errors:
+                return fn(instance, errors)
+
+            result = serializer.load(data, instance=instance, partial=True)
             if not result.errors and not result.data.id:
                 abort(HTTPStatus.NOT_FOUND)
             return fn(*result)
@@ -53,8 +107,13 @@ def put_loader(*decorator_args, serializer):
     def wrapped(fn):
         @wraps(fn)
         def decorated(*args, **kwargs):
-            result = serializer.load(request.get_json(),
-                                     instance=kwargs.pop('instance'))
+            data = request.get_json()
+            instance = kwargs.pop('instance')
+            errors = validate_request_body(serializer, data)
+            if errors:
+                return fn(instance, errors)
+
+            result = serializer.load(data, instance=instance)
             if not result.errors and not result.data.id:
                 abort(HTTPStatus.NOT_FOUND)
             return fn(*result)
@@ -74,7 +133,11 @@ def post_loader(*decorator_args, serializer):
     def wrapped(fn):
         @wraps(fn)
         def decorated(*args, **kwargs):
-            return fn(*serializer.load(request.get_json()))
+            data = request.get_json()
+            errors = validate_request_body(serializer, data)
+            if errors:
+                return fn(None, errors)
+            return fn(*serializer.load(data))
         return decorated
 
     if decorator_args and callable(decorator_args[0]):
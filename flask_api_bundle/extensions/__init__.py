@@ -1,8 +1,23 @@
+from .idempotency import Idempotency
 from .marshmallow import Marshmallow
+from .openapi import OpenAPI
+from .pool_metrics import PoolMetrics
+from .replicas import ReadReplicas
+from .write_behind import ShuttingDown, WriteBehind
 
 
+idempotency = Idempotency()
 ma = Marshmallow()
+openapi = OpenAPI()
+pool_metrics = PoolMetrics()
+replicas = ReadReplicas()
+write_behind = WriteBehind()
 
 EXTENSIONS = {
     'ma': (ma, ['db']),
+    'openapi': (openapi, ['ma']),
+    'replicas': (replicas, ['db']),
+    'write_behind': (write_behind, ['db']),
+    'idempotency': (idempotency, []),
+    'pool_metrics': (pool_metrics, ['db']),
 }
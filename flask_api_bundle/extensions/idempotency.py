@@ -0,0 +1,124 @@
+import hashlib
+import json
+
+from flask import Flask, current_app, request
+from http import HTTPStatus
+from werkzeug.http import is_hop_by_hop_header
+
+from ..idempotency import MemoryIdempotencyStore
+
+
+class Idempotency:
+    """
+    Makes write requests with an ``Idempotency-Key`` header safe to retry: the
+    first response for each key is stored (for ``API_IDEMPOTENCY_TTL``
+    seconds), and replayed for any later requests from the same caller with
+    the same key, method and path, without running the view again. Duplicate
+    requests made while the first one is still in-flight wait for it to
+    finish. Reusing a key for a request with a different body is an error.
+
+    The backend defaults to an in-process store; set the
+    ``API_IDEMPOTENCY_STORE`` config option to a callable returning an
+    :class:`~flask_api_bundle.idempotency.IdempotencyStore` (it gets passed
+    the app) to use a different one.
+    """
+    def __init__(self):
+        self.store = None
+        self.header = None
+        self.ttl = None
+        self.wait_timeout = None
+
+    def init_app(self, app: Flask):
+        store_factory = app.config.get('API_IDEMPOTENCY_STORE')
+        if store_factory:
+            self.store = store_factory(app)
+        else:
+            self.store = MemoryIdempotencyStore(
+                app.config.get('API_IDEMPOTENCY_MAX_KEYS'))
+        self.header = app.config.get('API_IDEMPOTENCY_HEADER')
+        self.ttl = app.config.get('API_IDEMPOTENCY_TTL')
+        self.wait_timeout = app.config.get('API_IDEMPOTENCY_WAIT_TIMEOUT')
+        app.extensions['idempotency'] = self
+
+    def get_key(self):
+        """
+        Get the store key for the current request, or ``None`` if it didn't
+        include an idempotency key
+        """
+        key = request.headers.get(self.header)
+        if not key:
+            return None
+        scope = f'{self.get_identity()}:{request.method}:{request.path}:{key}'
+        return hashlib.sha1(scope.encode('utf-8')).hexdigest()
+
+    def get_identity(self):
+        """
+        Get the identity of the caller, so that callers can't replay each
+        other's responses: the ``Authorization`` (or ``Authentication-Token``)
+        header, or else the session cookie
+        """
+        return (request.headers.get('Authorization')
+                or request.headers.get('Authentication-Token')
+                or request.cookies.get(current_app.session_cookie_name)
+                or '')
+
+    def get_fingerprint(self):
+        """
+        Get a hash of the current request's body, to detect an idempotency key
+        being reused for a different request
+        """
+        return hashlib.sha1(request.get_data()).hexdigest()
+
+    def run(self, key, fn):
+        """
+        Get the response for an idempotency key, either by replaying the
+        stored response or by calling ``fn`` (and storing its response)
+        """
+        fingerprint = self.get_fingerprint()
+        stored = self.store.get(key)
+        if stored is not None:
+            return self._replay(stored, fingerprint)
+
+        while not self.store.acquire(key):
+            if not self.store.wait(key, self.wait_timeout):
+                return self._error_response(
+                    'A request with this idempotency key is still in '
+                    'progress.', HTTPStatus.CONFLICT)
+
+        try:
+            stored = self.store.get(key)
+            if stored is not None:
+                return self._replay(stored, fingerprint)
+
+            response = fn()
+            # server errors are worth retrying, so don't store them
+            if (response.status_code < HTTPStatus.INTERNAL_SERVER_ERROR
+                    and not response.is_streamed):
+                self.store.set(key, (fingerprint,
+                                     response.get_data(),
+                                     response.status_code,
+                                     self._get_stored_headers(response)),
+                               self.ttl)
+            return response
+        finally:
+            self.store.release(key)
+
+    def _get_stored_headers(self, response):
+        # cookies (and connection-specific headers) belong to the original
+        # response only
+        return [(name, value) for name, value in response.headers.items()
+                if name.lower() != 'set-cookie'
+                and not is_hop_by_hop_header(name)]
+
+    def _replay(self, stored, fingerprint):
+        stored_fingerprint, data, status, headers = stored
+        if stored_fingerprint != fingerprint:
+            return self._error_response(
+                'This idempotency key was already used for a different '
+                'request.', HTTPStatus.UNPROCESSABLE_ENTITY)
+        return current_app.response_class(data, status, headers)
+
+    def _error_response(self, message, status):
+        return current_app.response_class(
+            json.dumps({'errors': {'_schema': [message]}}), status,
+            mimetype='application/json')
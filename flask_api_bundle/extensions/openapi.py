@@ -0,0 +1,55 @@
+import hashlib
+import json
+
+from flask import Flask, current_app, request
+from threading import Lock
+
+from ..openapi import build_openapi_spec
+
+
+class OpenAPI:
+    """
+    Builds the OpenAPI document for the app's model resources once (lazily,
+    the first time it's needed), and optionally serves it (with an ETag) at
+    the ``API_OPENAPI_URL`` config option.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self._spec = None
+        self._json = None
+        self._etag = None
+
+    def init_app(self, app: Flask):
+        self._spec = self._json = self._etag = None
+        app.extensions['openapi'] = self
+
+        url = app.config.get('API_OPENAPI_URL')
+        if url:
+            app.add_url_rule(url, 'api_openapi', self.view)
+
+    @property
+    def spec(self):
+        if self._spec is None:
+            with self._lock:
+                if self._spec is None:
+                    self._build(current_app)
+        return self._spec
+
+    def to_json(self, indent=None):
+        if indent is not None:
+            return json.dumps(self.spec, indent=indent)
+        self.spec  # make sure it's been built
+        return self._json
+
+    def view(self):
+        self.spec  # make sure it's been built
+        response = current_app.response_class(self._json,
+                                               mimetype='application/json')
+        response.set_etag(self._etag)
+        return response.make_conditional(request)
+
+    def _build(self, app: Flask):
+        spec = build_openapi_spec(app)
+        self._json = json.dumps(spec)
+        self._etag = hashlib.sha1(self._json.encode('utf-8')).hexdigest()
+        self._spec = spec
@@ -0,0 +1,86 @@
+import time
+
+from flask import Flask, jsonify
+from flask_sqlalchemy_bundle import db
+from functools import wraps
+from sqlalchemy import event
+from threading import Lock
+
+
+class PoolMetrics:
+    """
+    Keeps track of how long requests wait to check out connections from the
+    database connection pools (enabled by the ``API_POOL_METRICS`` config
+    option), and optionally serves them as JSON at ``API_POOL_METRICS_URL``.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self._engines = {}
+        self._stats = {}
+
+    def init_app(self, app: Flask):
+        self._engines = {}
+        self._stats = {}
+        app.extensions['pool_metrics'] = self
+        if not app.config.get('API_POOL_METRICS'):
+            return
+
+        for bind in [None] + list(app.config.get('SQLALCHEMY_BINDS') or {}):
+            bind_key = bind or 'default'
+            engine = db.get_engine(app, bind=bind)
+            self._engines[bind_key] = engine
+            self._stats[bind_key] = {'checkouts': 0, 'total_wait': 0.0,
+                                     'max_wait': 0.0}
+            self._instrument(bind_key, engine.pool)
+            event.listen(engine, 'engine_disposed', self._reinstrument)
+
+        url = app.config.get('API_POOL_METRICS_URL')
+        if url:
+            app.add_url_rule(url, 'api_pool_metrics',
+                             lambda: jsonify(self.snapshot()))
+
+    def snapshot(self):
+        """
+        Get the checkout wait time stats (in seconds) and current status of
+        each connection pool
+        """
+        with self._lock:
+            stats = {bind: dict(stats) for bind, stats in self._stats.items()}
+
+        for bind, engine in self._engines.items():
+            checkouts = stats[bind]['checkouts']
+            stats[bind]['avg_wait'] = 0.0
+            if checkouts:
+                stats[bind]['avg_wait'] = stats[bind]['total_wait'] / checkouts
+
+            for attr in ['size', 'checkedout', 'overflow']:
+                fn = getattr(engine.pool, attr, None)
+                if callable(fn):
+                    stats[bind][attr] = fn()
+        return stats
+
+    def _instrument(self, bind, pool):
+        connect = pool.connect
+
+        @wraps(connect)
+        def timed_connect(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return connect(*args, **kwargs)
+            finally:
+                self._record(bind, time.perf_counter() - start)
+
+        pool.connect = timed_connect
+
+    def _reinstrument(self, engine):
+        # disposing of an engine replaces its pool with a new one
+        for bind, instrumented_engine in self._engines.items():
+            if instrumented_engine is engine:
+                self._instrument(bind, engine.pool)
+
+    def _record(self, bind, wait):
+        with self._lock:
+            stats = self._stats[bind]
+            stats['checkouts'] += 1
+            stats['total_wait'] += wait
+            stats['max_wait'] = max(stats['max_wait'], wait)
@@ -0,0 +1,128 @@
+import math
+import time
+
+from flask import Flask, after_this_request, current_app, g, request
+from flask_sqlalchemy_bundle import db
+from itertools import count
+from threading import Lock
+
+from ..batch import LAST_WRITE_ATTR, SAFE_METHODS, in_batch_transaction
+
+
+class ReadReplicas:
+    """
+    Routes safe-method (read-only) queries from model resources to the
+    database binds listed in the ``API_READ_REPLICA_BINDS`` config option. Once
+    a client writes, its reads stay on the primary database for
+    ``API_READ_YOUR_WRITES_SECONDS`` (tracked with a cookie), so that it
+    doesn't read stale data from a lagging replica.
+    """
+    def __init__(self):
+        self.binds = []
+        self.read_your_writes = None
+        self.cookie_name = None
+        self._lock = Lock()
+        self._sessions = []
+        self._counter = count()
+
+    def init_app(self, app: Flask):
+        self.binds = list(app.config.get('API_READ_REPLICA_BINDS') or [])
+        self.read_your_writes = app.config.get('API_READ_YOUR_WRITES_SECONDS')
+        self.cookie_name = app.config.get('API_READ_YOUR_WRITES_COOKIE')
+        self._sessions = []
+        app.extensions['read_replicas'] = self
+
+        if self.binds:
+            app.teardown_appcontext(self._remove_sessions)
+
+    @property
+    def enabled(self):
+        return bool(self.binds)
+
+    def get_session(self):
+        """
+        Get the session for one of the replicas (round-robin)
+        """
+        if not self._sessions:
+            with self._lock:
+                if not self._sessions:
+                    self._sessions = [
+                        db.create_scoped_session(options=dict(
+                            bind=db.get_engine(current_app, bind=bind),
+                            binds={}))
+                        for bind in self.binds]
+        return self._sessions[next(self._counter) % len(self._sessions)]
+
+    def should_route(self):
+        """
+        Check if reads for the current request should go to a replica
+        """
+        if (not self.binds
+                or request.method not in SAFE_METHODS
+                or in_batch_transaction()):
+            return False
+        elif not self.read_your_writes:
+            return True
+
+        # writes made earlier in the same app context (ie by the sub-requests
+        # of a batch request) aren't in the request's cookies yet
+        wrote_at = g.get(LAST_WRITE_ATTR)
+        if wrote_at is None:
+            try:
+                wrote_at = float(request.cookies.get(self.cookie_name, 0))
+            except ValueError:
+                wrote_at = 0
+        return time.time() - wrote_at > self.read_your_writes
+
+    def query(self, model):
+        """
+        Get a query for the given model, from a replica if possible, otherwise
+        from the primary database
+        """
+        if self.should_route():
+            return self.get_session().query(model)
+        return model.query
+
+    def get_bind(self, model):
+        """
+        Get the engine to read the given model's table with, from a replica if
+        possible, otherwise ``None``
+        """
+        if (getattr(model, '__bind_key__', None) is None
+                and self.should_route()):
+            return self.get_session().bind
+        return None
+
+    def record_write(self):
+        """
+        Mark the current client as having written to the primary database
+        """
+        if not (self.binds and self.read_your_writes):
+            return
+
+        setattr(g, LAST_WRITE_ATTR, time.time())
+        after_this_request(self.set_cookie)
+
+    def set_cookie(self, response):
+        """
+        Set the read-your-writes cookie on the response, if the client wrote
+        during the current app context
+        """
+        wrote_at = g.get(LAST_WRITE_ATTR)
+        if wrote_at is not None:
+            response.set_cookie(self.cookie_name, str(wrote_at),
+                                max_age=math.ceil(self.read_your_writes),
+                                httponly=True)
+        return response
+
+    def release(self):
+        """
+        End the transactions of the replica sessions of the current app context,
+        returning their connections to the pool
+        """
+        for session in self._sessions:
+            session.rollback()
+
+    def _remove_sessions(self, exception=None):
+        for session in self._sessions:
+            session.remove()
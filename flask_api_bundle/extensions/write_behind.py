@@ -0,0 +1,193 @@
+import atexit
+
+from collections import OrderedDict
+from flask import Flask, current_app, jsonify, url_for
+from flask_sqlalchemy_bundle import db
+from http import HTTPStatus
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+from uuid import uuid4
+
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+STATUS_ENDPOINT = 'api_write_behind_status'
+
+
+class ShuttingDown(Exception):
+    """
+    Raised when trying to queue an instance after :meth:`WriteBehind.shutdown`
+    """
+
+
+class WriteBehind:
+    """
+    An in-process, bounded queue of model instances to be saved by a
+    background worker thread, which flushes them in grouped transactions. Used
+    by model resources with ``write_behind = True`` to respond to create
+    requests before the data has been committed. Pending writes are flushed
+    when :meth:`shutdown` gets called, which happens automatically when the
+    interpreter exits normally (but not if the process gets killed).
+    """
+    def __init__(self):
+        self.app = None
+        self.queue = None
+        self.batch_size = None
+        self.put_timeout = None
+        self._statuses = OrderedDict()
+        self._max_statuses = None
+        self._lock = Lock()
+        self._put_lock = Lock()
+        self._stopped = Event()
+        self._worker = None
+
+    def init_app(self, app: Flask):
+        # flush anything still queued for a previous app, and start over
+        self.shutdown()
+        self._stopped = Event()
+        self._worker = None
+        with self._lock:
+            self._statuses = OrderedDict()
+
+        self.app = app
+        self.queue = Queue(app.config.get('API_WRITE_BEHIND_QUEUE_SIZE'))
+        self.batch_size = app.config.get('API_WRITE_BEHIND_BATCH_SIZE')
+        self.put_timeout = app.config.get('API_WRITE_BEHIND_PUT_TIMEOUT')
+        self._max_statuses = app.config.get('API_WRITE_BEHIND_MAX_STATUSES')
+        app.extensions['write_behind'] = self
+
+    def register_status_view(self, app: Flask):
+        """
+        Serve the statuses at ``API_WRITE_BEHIND_STATUS_URL`` (called once a
+        model resource with ``write_behind = True`` gets registered)
+        """
+        url = app.config.get('API_WRITE_BEHIND_STATUS_URL')
+        if url and STATUS_ENDPOINT not in app.view_functions:
+            app.add_url_rule(url, STATUS_ENDPOINT, self.status_view)
+
+    def enqueue(self, instance):
+        """
+        Queue an instance to be saved, returning a handle to check its status
+        with. Raises :class:`queue.Full` if the queue is still full after
+        waiting ``API_WRITE_BEHIND_PUT_TIMEOUT`` seconds, or
+        :class:`ShuttingDown` after :meth:`shutdown` has been called.
+        """
+        # the instance may have been cascaded into the request's session (eg
+        # when assigned to a relationship of a persistent object); the worker
+        # merges it into its own session instead
+        if instance in db.session:
+            db.session.expunge(instance)
+
+        handle = uuid4().hex
+        # hold the lock until the instance has been queued, so that shutdown
+        # can't stop the worker in between checking and queueing
+        with self._put_lock:
+            if self._stopped.is_set():
+                raise ShuttingDown()
+            self._ensure_worker()
+
+            self._set_status(handle, PENDING)
+            try:
+                self.queue.put((handle, instance), timeout=self.put_timeout)
+            except Full:
+                self._set_status(handle, None)
+                raise
+        return handle
+
+    def get_status(self, handle):
+        with self._lock:
+            return self._statuses.get(handle)
+
+    def status_url(self, handle):
+        if STATUS_ENDPOINT not in current_app.view_functions:
+            return None
+        return url_for(STATUS_ENDPOINT, handle=handle)
+
+    def status_view(self, handle):
+        status = self.get_status(handle)
+        if status is None:
+            return jsonify(errors={'handle': ['Unknown handle.']}), \
+                   HTTPStatus.NOT_FOUND
+        return jsonify(status)
+
+    def shutdown(self):
+        """
+        Stop accepting writes, and wait for everything that's still queued to
+        be saved
+        """
+        with self._put_lock:
+            self._stopped.set()
+
+        if self._worker is not None:
+            self._worker.join()
+
+        # in case the worker never started (or died), save the rest here
+        while self.queue is not None and not self.queue.empty():
+            self._flush_next()
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+
+        with self._lock:
+            if self._worker is None:
+                self._worker = Thread(target=self._run, daemon=True,
+                                      name='api-write-behind')
+                self._worker.start()
+                # the worker is a daemon thread, so make sure it gets to
+                # finish before the interpreter exits (registered only once)
+                atexit.unregister(self.shutdown)
+                atexit.register(self.shutdown)
+
+    def _run(self):
+        while not (self._stopped.is_set() and self.queue.empty()):
+            try:
+                self._flush_next(timeout=0.1)
+            except Exception:
+                self.app.logger.exception('Write-behind worker error')
+
+    def _flush_next(self, timeout=0):
+        try:
+            items = [self.queue.get(timeout=timeout)]
+        except Empty:
+            return
+
+        while len(items) < self.batch_size:
+            try:
+                items.append(self.queue.get_nowait())
+            except Empty:
+                break
+
+        with self.app.app_context():
+            self._flush(items)
+
+    def _flush(self, items):
+        try:
+            merged = [db.session.merge(instance) for _, instance in items]
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            if len(items) == 1:
+                self.app.logger.exception('Write-behind save failed')
+                self._set_status(items[0][0], FAILED)
+            else:
+                # retry one by one so that only the bad rows get dropped
+                for item in items:
+                    self._flush([item])
+            return
+
+        for (handle, _), instance in zip(items, merged):
+            self._set_status(handle, DONE, getattr(instance, 'id', None))
+
+    def _set_status(self, handle, status, id=None):
+        with self._lock:
+            if status is None:
+                self._statuses.pop(handle, None)
+                return
+
+            self._statuses[handle] = {'status': status, 'id': id}
+            self._statuses.move_to_end(handle)
+            while len(self._statuses) > self._max_statuses:
+                self._statuses.popitem(last=False)
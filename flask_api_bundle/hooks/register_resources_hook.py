@@ -2,6 +2,7 @@ import inspect
 
 from flask_unchained import AppFactoryHook
 
+from ..extensions import write_behind
 from ..model_resource import ModelResource
 
 
@@ -21,6 +22,9 @@ class RegisterResourcesHook(AppFactoryHook):
             self.attach_serializers_to_resource_cls(model_name, resource_cls)
             self.store.resources_by_model[model_name] = resource_cls
 
+            if resource_cls.write_behind:
+                write_behind.register_status_view(app)
+
     def attach_serializers_to_resource_cls(self, model_name, resource_cls):
         try:
             serializer_cls = self.store.serializers_by_model[model_name]
@@ -0,0 +1,89 @@
+import time
+
+from collections import OrderedDict
+from threading import Event, Lock
+
+
+class IdempotencyStore:
+    """
+    Base class for idempotency key backends. Stored values are opaque tuples
+    that need to be kept until their ttl (in seconds) expires. Backends also
+    need to track which keys are in-flight (ie, still being handled by the
+    first request using them), so that concurrent duplicate requests can wait
+    for the first one to finish instead of running again.
+    """
+    def get(self, key):
+        """
+        Get the stored value for a key, or ``None`` if there isn't one
+        """
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        """
+        Store the value for a key
+        """
+        raise NotImplementedError
+
+    def acquire(self, key):
+        """
+        Mark a key as in-flight. Returns ``False`` if it already was.
+        """
+        raise NotImplementedError
+
+    def release(self, key):
+        """
+        Mark a key as no longer in-flight (waking up any waiters)
+        """
+        raise NotImplementedError
+
+    def wait(self, key, timeout):
+        """
+        Wait for an in-flight key to be released. Returns ``False`` if it
+        timed out.
+        """
+        raise NotImplementedError
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """
+    An in-process idempotency key backend, holding at most ``max_keys`` values
+    (the oldest get evicted first)
+    """
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._lock = Lock()
+        self._values = OrderedDict()
+        self._in_flight = {}
+
+    def get(self, key):
+        with self._lock:
+            expires_at, value = self._values.get(key, (None, None))
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._values[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._values[key] = (time.monotonic() + ttl, value)
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_keys:
+                self._values.popitem(last=False)
+
+    def acquire(self, key):
+        with self._lock:
+            if key in self._in_flight:
+                return False
+            self._in_flight[key] = Event()
+            return True
+
+    def release(self, key):
+        with self._lock:
+            event = self._in_flight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def wait(self, key, timeout):
+        with self._lock:
+            event = self._in_flight.get(key)
+        return event is None or event.wait(timeout)
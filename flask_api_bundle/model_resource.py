@@ -10,21 +10,31 @@ from flask_unchained import (
 from flask_unchained.bundles.controller.metaclasses import ResourceMeta
 from flask_unchained.bundles.controller.route import Route
 from flask_unchained.bundles.controller.utils import get_param_tuples
-from flask_sqlalchemy_bundle import BaseModel, SessionManager, param_converter
+from flask_sqlalchemy_bundle import (
+    BaseModel, SessionManager, db, param_converter)
 from flask_unchained import unchained, injectable
 from flask_unchained.utils import deep_getattr
 from functools import partial
 from http import HTTPStatus
 from marshmallow import MarshalResult
+from queue import Full
 from types import FunctionType
 from typing import *
+from warnings import warn
 from werkzeug.wrappers import Response
 
-from .decorators import list_loader, patch_loader, put_loader, post_loader
+from .batch import in_batch_transaction
+from .decorators import (
+    list_loader, member_loader, patch_loader, put_loader, post_loader)
+from .export import ModelExporter
+from .extensions import ShuttingDown, idempotency, replicas, write_behind
 from .model_serializer import ModelSerializer
 from .utils import unpack
 
 
+IDEMPOTENCY_KEY_METHODS = {CREATE, DELETE, PATCH, PUT}
+
+
 class ModelResourceMeta(ResourceMeta):
     def __new__(mcs, name, bases, clsdict):
         if ABSTRACT_ATTR in clsdict:
@@ -77,6 +87,30 @@ class ModelResource(Resource, metaclass=ModelResourceMeta):
         Dict[str, Union[List[FunctionType], Tuple[FunctionType]]],
     ] = {}
 
+    # whether or not list/get queries may go to the read replica binds
+    use_read_replicas: bool = True
+
+    # whether or not created instances should be queued to be saved in the
+    # background (responding with HTTP 202 instead of 201)
+    write_behind: bool = False
+
+    # whether or not to support the Idempotency-Key header on write endpoints
+    use_idempotency_keys: bool = True
+
+    # the formats (csv and/or ndjson) the list view can stream all records in,
+    # when requested by the Accept header. NOTE: exports bypass the list view
+    # (and its query), so if the list view filters or scopes which records
+    # get returned, override get_export_query to do the same
+    export_formats: Union[List[str], Set[str], Tuple[str]] = ()
+    export_chunk_size: int = 1000
+
+    # whether or not to end the session's transaction (returning its
+    # connection to the pool) as soon as the response data has been dumped,
+    # instead of holding on to it until the app context gets torn down.
+    # NOTE: model instances loaded during the request get expired, so
+    # anything using them later in the request will query for them again
+    release_connections: bool = False
+
     def __init__(self, session_manager: SessionManager = injectable):
         self.session_manager = session_manager
         if isinstance(self.model, str):
@@ -144,17 +178,46 @@ class ModelResource(Resource, metaclass=ModelResourceMeta):
         """
         Convenience method for saving a model (automatically commits it to
         the database and returns the object with an HTTP 201 status code)
+
+        If the resource has ``write_behind`` enabled, the model is instead
+        queued to be saved in the background, and a handle to check on its
+        status is returned with an HTTP 202 status code (or an HTTP 503 status
+        code if the queue is full, or the app is shutting down).
         """
-        if commit:
-            self.session_manager.save(instance, commit=True)
+        if commit and self.write_behind and not in_batch_transaction():
+            return self.queued(instance)
+        elif commit:
+            self._commit(self.session_manager.save, instance)
         return instance, HTTPStatus.CREATED
 
+    def queued(self, instance):
+        """
+        Convenience method for queueing a model to be saved in the background
+        (returns a handle to check its status with an HTTP 202 status code)
+        """
+        try:
+            handle = write_behind.enqueue(instance)
+        except Full:
+            return ({'errors': {'_schema': ['Too many pending writes.']}},
+                    HTTPStatus.SERVICE_UNAVAILABLE, {'Retry-After': '1'})
+        except ShuttingDown:
+            return ({'errors': {'_schema': ['The server is shutting down.']}},
+                    HTTPStatus.SERVICE_UNAVAILABLE, {'Retry-After': '1'})
+
+        replicas.record_write()
+        headers = {}
+        status_url = write_behind.status_url(handle)
+        if status_url:
+            headers['Location'] = status_url
+        return ({'handle': handle, 'status': 'pending'},
+                HTTPStatus.ACCEPTED, headers)
+
     def deleted(self, instance):
         """
         Convenience method for deleting a model (automatically commits the
         delete to the database and returns with an HTTP 204 status code)
         """
-        self.session_manager.delete(instance, commit=True)
+        self._commit(self.session_manager.delete, instance)
         return '', HTTPStatus.NO_CONTENT
 
     def updated(self, instance):
@@ -162,13 +225,65 @@ class ModelResource(Resource, metaclass=ModelResourceMeta):
         Convenience method for updating a model (automatically commits it to
         the database and returns the object with with an HTTP 200 status code)
         """
-        self.session_manager.save(instance, commit=True)
+        self._commit(self.session_manager.save, instance)
         return instance
 
+    def _commit(self, fn, instance):
+        # writes from a transactional batch request only get flushed here (the
+        # batch view commits or rolls back once all of its writes have run)
+        if in_batch_transaction():
+            fn(instance, commit=False)
+            db.session.flush()
+        else:
+            fn(instance, commit=True)
+        replicas.record_write()
+
+    def get_exporter(self):
+        if not self.export_formats:
+            return None
+
+        # the selected columns only depend upon the serializer, so build the
+        # exporter once per resource class
+        exporter = self.__class__.__dict__.get('_exporter')
+        if exporter is None:
+            exporter = ModelExporter(self.model, self.serializer_many,
+                                     self.export_formats,
+                                     self.export_chunk_size)
+            setattr(self.__class__, '_exporter', exporter)
+
+            cls = self.__class__
+            if (cls.list is not ModelResource.list
+                    and cls.get_export_query is ModelResource.get_export_query):
+                warn(f'{cls.__name__} overrides list but not '
+                     f'get_export_query, so its exports include all '
+                     f'{self.model.__name__} records')
+        return exporter
+
+    def get_export_query(self):
+        """
+        Get the query that exports stream rows from. Defaults to selecting the
+        exported columns of all records; override it to filter them, eg::
+
+            def get_export_query(self):
+                return super().get_export_query().where(
+                    Article.author_id == current_user.id)
+        """
+        return self.get_exporter().select()
+
     def dispatch_request(self, method_name, *view_args, **view_kwargs):
+        if self.use_idempotency_keys and method_name in IDEMPOTENCY_KEY_METHODS:
+            key = idempotency.get_key()
+            if key:
+                return idempotency.run(key, lambda: self._dispatch_request(
+                    method_name, *view_args, **view_kwargs))
+        return self._dispatch_request(method_name, *view_args, **view_kwargs)
+
+    def _dispatch_request(self, method_name, *view_args, **view_kwargs):
         resp = super().dispatch_request(method_name, *view_args, **view_kwargs)
         rv, code, headers = unpack(resp)
         if isinstance(rv, Response):
+            if not rv.is_streamed:
+                self.release_session()
             return self.make_response(rv, code, headers)
 
         if isinstance(rv, MarshalResult):
@@ -177,9 +292,38 @@ class ModelResource(Resource, metaclass=ModelResourceMeta):
             rv = self.serializer_many.dump(rv).data
         elif isinstance(rv, self.model):
             rv = self.serializer.dump(rv).data
-
+        else:
+            # other return values may be (dicts containing) models, which
+            # still need to lazy load from the session while being encoded
+            response = self.make_response(rv, code, headers)
+            self.release_session()
+            return response
+
+        # the data has been dumped, so give back the connection(s) before
+        # the response body gets encoded
+        self.release_session()
         return self.make_response(rv, code, headers)
 
+    def release_session(self):
+        """
+        End the transaction of the session (and any read replica sessions),
+        returning their connections to the pool. Skipped for transactional
+        batch requests, which still have writes to commit, and when the
+        session has changes that haven't been flushed yet.
+        """
+        if not self.release_connections or in_batch_transaction():
+            return
+
+        session = db.session()
+        if session.new or session.dirty or session.deleted:
+            return
+
+        # rolling back (instead of closing the session) keeps loaded model
+        # instances attached, so anything that uses them later in the request
+        # (eg current_user) just reloads them using a new connection
+        session.rollback()
+        replicas.release()
+
     def make_response(self, data, code=200, headers=None):
         headers = headers or {}
         if isinstance(data, Response):
@@ -203,7 +347,10 @@ class ModelResource(Resource, metaclass=ModelResourceMeta):
             return decorators
 
         if method_name == LIST:
-            decorators.append(partial(list_loader, model=self.model))
+            decorators.append(partial(list_loader, model=self.model,
+                                      replica=self.use_read_replicas,
+                                      exporter=self.get_exporter(),
+                                      export_query=self.get_export_query))
         elif method_name in MEMBER_METHODS:
             param_name = get_param_tuples(self.member_param)[0][1]
             kw_name = 'instance'  # needed by the patch/put loaders
@@ -213,8 +360,14 @@ class ModelResource(Resource, metaclass=ModelResourceMeta):
             if method_name in {DELETE, GET}:
                 sig = inspect.signature(getattr(self, method_name))
                 kw_name = list(sig.parameters.keys())[0]
-            decorators.append(partial(
-                param_converter, **{param_name: {kw_name: self.model}}))
+            if (method_name == GET and self.use_read_replicas
+                    and replicas.enabled):
+                decorators.append(partial(member_loader, model=self.model,
+                                          param_name=param_name,
+                                          kw_name=kw_name))
+            else:
+                decorators.append(partial(
+                    param_converter, **{param_name: {kw_name: self.model}}))
 
         if method_name == CREATE:
             decorators.append(partial(post_loader,
@@ -219,14 +219,49 @@ class ModelSerializer(ModelSchema, metaclass=ModelSerializerMeta):
         if not isinstance(data, dict):
             return result, errors
 
+        plan = self._get_validation_plan()
+        present = {key: attr_name for key, attr_name in plan.items()
+                   if key in data}
+        if not present:
+            return result, errors
+
         try:
-            self.Meta.model.validate(**data)
+            self.Meta.model.validate(**{attr_name: data[key]
+                                        for key, attr_name in present.items()})
         except db.ValidationErrors as e:
+            # report model errors under the keys used in the request data
+            keys_by_attr_name = {v: k for k, v in present.items()}
             for column, col_errors in e.errors.items():
-                for error in col_errors:
-                    if column in errors:
-                        errors[column].append(error)
-                    else:
-                        errors[column] = [error]
+                errors.setdefault(keys_by_attr_name.get(column, column),
+                                  []).extend(col_errors)
 
         return result, errors
+
+    def _get_validation_plan(self):
+        """
+        Get the mapping of request data keys to the names of the model
+        attributes that have validators. This only depends upon the fields of
+        the serializer, so it gets computed once and cached on the class.
+        """
+        cache = self.__class__.__dict__.get('_validation_plans')
+        if cache is None:
+            cache = {}
+            setattr(self.__class__, '_validation_plans', cache)
+
+        cache_key = tuple(self.fields)
+        if cache_key in cache:
+            return cache[cache_key]
+
+        validators = getattr(self.Meta.model, '__validators__', None)
+        plan = {}
+        for name, field in self.fields.items():
+            attr_name = field.attribute or name
+            if field.dump_only or (validators is not None
+                                   and not validators.get(attr_name)):
+                continue
+            plan[name] = attr_name
+            if field.load_from:
+                plan[field.load_from] = attr_name
+
+        cache[cache_key] = plan
+        return plan
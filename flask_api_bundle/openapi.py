@@ -0,0 +1,270 @@
+import inspect
+import marshmallow as ma
+
+from flask import Flask, current_app
+from flask_unchained import ALL_METHODS, CREATE, DELETE, LIST, PATCH, PUT
+from flask_unchained.bundles.controller.attr_constants import (
+    CONTROLLER_ROUTES_ATTR)
+from flask_unchained.string_utils import title_case
+from marshmallow_sqlalchemy.fields import Related
+from werkzeug.routing import parse_rule
+
+
+OPENAPI_VERSION = '3.0.0'
+
+# ordered so that subclasses come before their parents
+FIELD_TYPES = (
+    (ma.fields.Boolean, 'boolean', None),
+    (ma.fields.Integer, 'integer', 'int32'),
+    (ma.fields.Float, 'number', 'float'),
+    (ma.fields.Number, 'number', None),
+    (ma.fields.DateTime, 'string', 'date-time'),
+    (ma.fields.Date, 'string', 'date'),
+    (ma.fields.Time, 'string', None),
+    (ma.fields.TimeDelta, 'integer', None),
+    (ma.fields.UUID, 'string', 'uuid'),
+    (ma.fields.Email, 'string', 'email'),
+    (ma.fields.Url, 'string', 'uri'),
+    (ma.fields.String, 'string', None),
+    (ma.fields.List, 'array', None),
+    (ma.fields.Dict, 'object', None),
+    (ma.fields.Nested, 'object', None),
+)
+
+CONVERTER_TYPES = {'int': 'integer', 'float': 'number'}
+
+# the JSON types accepted by the fast request validator. these are all
+# supersets of what marshmallow accepts, so that the fast path doesn't reject
+# values that marshmallow would have loaded
+JSON_TYPES = {
+    'array': ((list,), 'Not a valid list.'),
+    'boolean': ((bool, int, str), 'Not a valid boolean.'),
+    'integer': ((int, float, str), 'Not a valid integer.'),
+    'number': ((int, float, str), 'Not a valid number.'),
+    'object': ((dict,), 'Not a valid mapping type.'),
+    'string': ((str,), 'Not a valid string.'),
+}
+
+
+def field_to_property(field: ma.fields.Field):
+    """
+    Convert a marshmallow field into an OpenAPI schema property
+    """
+    prop = {}
+    for field_cls, type_, format_ in FIELD_TYPES:
+        if isinstance(field, field_cls):
+            prop['type'] = type_
+            if format_:
+                prop['format'] = format_
+            break
+
+    if isinstance(field, ma.fields.List):
+        prop['items'] = field_to_property(field.container)
+    elif isinstance(field, ma.fields.Nested) and field.many:
+        prop['type'] = 'array'
+        prop['items'] = {'type': 'object'}
+    elif isinstance(field, Related):
+        prop['description'] = 'The primary key of the related object'
+
+    for validator in field.validators:
+        if isinstance(validator, ma.validate.Length):
+            key = prop.get('type') == 'array' and 'Items' or 'Length'
+            if validator.min is not None:
+                prop[f'min{key}'] = validator.min
+            if validator.max is not None:
+                prop[f'max{key}'] = validator.max
+        elif isinstance(validator, ma.validate.OneOf):
+            prop['enum'] = list(validator.choices)
+
+    if field.allow_none:
+        prop['nullable'] = True
+    if field.dump_only:
+        prop['readOnly'] = True
+    elif field.load_only:
+        prop['writeOnly'] = True
+    return prop
+
+
+def serializer_to_schema(serializer: ma.Schema, partial=False):
+    """
+    Convert a (ModelSerializer) instance into an OpenAPI schema object, using
+    the camel-cased field names that it dumps to and loads from. Partial
+    schemas (for patch request bodies) don't have any required fields.
+    """
+    properties = {}
+    required = []
+    for name, field in serializer.fields.items():
+        key = field.load_from or field.dump_to or name
+        properties[key] = field_to_property(field)
+        if field.required and not field.dump_only and not partial:
+            required.append(key)
+
+    schema = {'type': 'object', 'properties': properties}
+    if required:
+        schema['required'] = required
+    return schema
+
+
+def build_openapi_spec(app: Flask):
+    """
+    Build the OpenAPI document for all of the :class:`ModelResource` routes
+    registered with the app
+    """
+    from .model_resource import ModelResource
+
+    schemas = {}
+    paths = {}
+
+    def schema_ref(serializer, partial=False):
+        name = serializer.__class__.__name__
+        if partial:
+            name = f'{name}Partial'
+        if name not in schemas:
+            schemas[name] = serializer_to_schema(serializer, partial)
+        return {'$ref': f'#/components/schemas/{name}'}
+
+    for rule in app.url_map.iter_rules():
+        resource_cls = getattr(app.view_functions.get(rule.endpoint),
+                               'view_class', None)
+        if not (inspect.isclass(resource_cls)
+                and issubclass(resource_cls, ModelResource)):
+            continue
+
+        method_name = rule.endpoint.rsplit('.', 1)[-1]
+        if (method_name not in ALL_METHODS
+                or method_name not in getattr(resource_cls,
+                                              CONTROLLER_ROUTES_ATTR, {})):
+            continue
+
+        path, parameters = _convert_rule(rule.rule)
+        operation = _make_operation(resource_cls, method_name, schema_ref)
+        operation['operationId'] = rule.endpoint
+        if parameters:
+            operation['parameters'] = parameters
+
+        for http_method in rule.methods - {'HEAD', 'OPTIONS'}:
+            paths.setdefault(path, {})[http_method.lower()] = operation
+
+    return {
+        'openapi': OPENAPI_VERSION,
+        'info': {
+            'title': app.config.get('API_OPENAPI_TITLE') or app.name,
+            'version': app.config.get('API_OPENAPI_VERSION'),
+        },
+        'paths': paths,
+        'components': {'schemas': schemas},
+    }
+
+
+def _convert_rule(rule):
+    path = ''
+    parameters = []
+    for converter, _, variable in parse_rule(rule):
+        if converter is None:
+            path += variable
+            continue
+
+        path += f'{{{variable}}}'
+        parameters.append({
+            'name': variable,
+            'in': 'path',
+            'required': True,
+            'schema': {'type': CONVERTER_TYPES.get(converter, 'string')},
+        })
+    return path, parameters
+
+
+def _make_operation(resource_cls, method_name, schema_ref):
+    operation = {'tags': [resource_cls.model.__name__]}
+    doc = inspect.getdoc(getattr(resource_cls, method_name))
+    if doc:
+        # strip any flasgger-style yaml after the --- separator
+        summary = doc.split('---')[0].strip()
+        if summary:
+            operation['summary'] = summary
+
+    if method_name == CREATE:
+        serializer = resource_cls.serializer_create
+    else:
+        serializer = resource_cls.serializer
+
+    if method_name in {CREATE, PATCH, PUT}:
+        schema = schema_ref(serializer, partial=method_name == PATCH)
+        operation['requestBody'] = {'required': True, 'content': {
+            'application/json': {'schema': schema}}}
+
+    if method_name == DELETE:
+        responses = {'204': {'description': 'Deleted'}}
+    else:
+        if method_name == LIST:
+            schema = {'type': 'array',
+                      'items': schema_ref(resource_cls.serializer_many)}
+        else:
+            schema = schema_ref(resource_cls.serializer)
+        code, description = (method_name == CREATE and ('201', 'Created')
+                             or ('200', 'OK'))
+        responses = {code: {'description': description, 'content': {
+            'application/json': {'schema': schema}}}}
+
+    if method_name in {CREATE, PATCH, PUT}:
+        responses['400'] = {'description': 'Validation errors'}
+    if method_name not in {CREATE, LIST}:
+        responses['404'] = {'description': 'Not found'}
+
+    operation['responses'] = responses
+    return operation
+
+
+class RequestValidator:
+    """
+    Fast structural validation of JSON request bodies, compiled once from the
+    OpenAPI properties of a serializer's fields. It only checks that required fields are
+    present and that values have the correct JSON type, so that obviously
+    invalid requests can be rejected without running marshmallow.
+    """
+    def __init__(self, serializer: ma.Schema):
+        self.fields = []
+        for name, field in serializer.fields.items():
+            if field.dump_only:
+                continue
+            prop = field_to_property(field)
+            types, message = JSON_TYPES.get(prop.get('type'), (None, None))
+            self.fields.append((name, field.load_from, field.required,
+                                prop.get('nullable'), types, message))
+
+    def validate(self, data, partial=False):
+        if data is None:
+            data = {}
+        elif not isinstance(data, dict):
+            return {'_schema': ['Invalid input type.']}
+
+        errors = {}
+        for name, load_from, required, nullable, types, message in self.fields:
+            # like marshmallow, look for the attribute name first, and then
+            # fall back to the load_from (camel-cased) key
+            key = name
+            if name not in data and load_from:
+                key = load_from
+
+            value = data.get(key)
+            if value is None:
+                if (required and not partial) or (key in data and not nullable):
+                    errors[key] = [f'{title_case(key)} is required.']
+            elif types and not isinstance(value, types):
+                errors[key] = [message]
+        return errors
+
+
+def validate_request_body(serializer: ma.Schema, data, partial=False):
+    """
+    Run the fast request validator for the given serializer (if enabled by the
+    ``API_VALIDATE_REQUESTS`` config option), returning any errors.
+    """
+    if not current_app.config.get('API_VALIDATE_REQUESTS'):
+        return {}
+
+    validator = getattr(serializer, '_request_validator', None)
+    if validator is None:
+        validator = RequestValidator(serializer)
+        serializer._request_validator = validator
+    return validator.validate(data, partial)
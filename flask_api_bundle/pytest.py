@@ -1,35 +1,174 @@
 import json
+import os
 import pytest
 
+from contextlib import contextmanager
 from flask_unchained.pytest import HtmlTestClient, HtmlTestResponse
 from werkzeug.utils import cached_property
 
 
+JSON_HEADERS = {'Content-Type': 'application/json',
+                'Accept': 'application/json'}
+JSON_NULL = 'null'
+
+
 class ApiTestClient(HtmlTestClient):
     def open(self, *args, **kwargs):
-        kwargs['data'] = json.dumps(kwargs.get('data'))
+        data = kwargs.get('data')
+        if data is None:
+            kwargs['data'] = JSON_NULL
+        else:
+            kwargs['data'] = json.dumps(data, separators=(',', ':'))
 
-        kwargs.setdefault('headers', {})
-        kwargs['headers']['Content-Type'] = 'application/json'
-        kwargs['headers']['Accept'] = 'application/json'
+        kwargs['headers'] = {**kwargs.get('headers', {}), **JSON_HEADERS}
 
         return super().open(*args, **kwargs)
 
 
 class ApiTestResponse(HtmlTestResponse):
-    @cached_property
+    @property
     def json(self):
         assert self.mimetype == 'application/json', (self.mimetype, self.data)
-        return json.loads(self.data)
+        # shares the parsed result with (cached by) get_json, so the body gets
+        # parsed at most once
+        return self.get_json()
 
     @cached_property
     def errors(self):
         return self.json.get('errors', {})
 
 
-@pytest.fixture()
-def api_client(app):
+def worker_database_uri(uri):
+    """
+    Make a database URI unique to the current pytest-xdist worker (if any), so
+    that tests running in parallel don't share a database. (In-memory SQLite
+    databases are already unique per process, so they're returned unchanged.)
+    """
+    worker = os.getenv('PYTEST_XDIST_WORKER')
+    if not worker or uri in {'sqlite://', 'sqlite:///:memory:'}:
+        return uri
+
+    uri, sep, query = uri.partition('?')
+    root, ext = os.path.splitext(uri)
+    return f'{root}_{worker}{ext}{sep}{query}'
+
+
+def seed_models(model, rows):
+    """
+    Bulk insert rows of column values for a model, without instantiating a
+    model object for each row.
+
+    :param model: The model class to insert rows for
+    :param rows: A list of dictionaries of column names to values
+    """
+    from flask_sqlalchemy_bundle import db
+    db.session.bulk_insert_mappings(model, rows)
+    db.session.commit()
+
+
+def enable_sqlite_savepoints(engine):
+    """
+    Apply pysqlite's SAVEPOINT workaround to an engine (the driver otherwise
+    manages transactions itself, breaking SAVEPOINTs), so that
+    :func:`transactional_session` works with SQLite databases
+    """
+    from sqlalchemy import event
+
+    @event.listens_for(engine, 'connect')
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, 'begin')
+    def do_begin(conn):
+        conn.execute('BEGIN')
+
+
+@contextmanager
+def transactional_session():
+    """
+    Bind the session to a connection-level transaction that gets rolled back
+    on exit, with the session itself running inside a SAVEPOINT that gets
+    restarted whenever the code under test commits or rolls back. (With
+    SQLite, the engine needs :func:`enable_sqlite_savepoints` applied for this
+    to work.)
+    """
+    from flask_sqlalchemy_bundle import db
+    from sqlalchemy import event
+
+    connection = db.engine.connect()
+    transaction = connection.begin()
+    session_kw = dict(db.session.session_factory.kw)
+    db.session.remove()
+    db.session.configure(bind=connection, binds={})
+    db.session.begin_nested()
+
+    def restart_savepoint(session, trans):
+        if trans.nested and not trans._parent.nested:
+            session.expire_all()
+            session.begin_nested()
+
+    event.listen(db.session, 'after_transaction_end', restart_savepoint)
+    try:
+        yield db.session
+    finally:
+        event.remove(db.session, 'after_transaction_end', restart_savepoint)
+        db.session.remove()
+        db.session.session_factory.kw.clear()
+        db.session.session_factory.kw.update(session_kw)
+        transaction.rollback()
+        connection.close()
+
+
+def _api_test_client(app):
     app.test_client_class = ApiTestClient
     app.response_class = ApiTestResponse
-    with app.test_client() as client:
+    return app.test_client()
+
+
+@pytest.fixture()
+def api_client(app):
+    with _api_test_client(app) as client:
+        yield client
+
+
+@pytest.fixture(scope='session')
+def api_app():
+    """
+    A session-scoped app, with its database tables created once, for tests
+    that use :func:`db_transaction` to isolate their changes. Override this
+    fixture in your ``conftest.py`` if your app needs to be created
+    differently (calling :func:`enable_sqlite_savepoints` if it uses SQLite).
+    """
+    from flask_sqlalchemy_bundle import db
+    from flask_unchained import AppFactory, TEST
+
+    app = AppFactory.create_app(TEST)
+    ctx = app.app_context()
+    ctx.push()
+    if db.engine.dialect.name == 'sqlite':
+        enable_sqlite_savepoints(db.engine)
+    db.create_all()
+    yield app
+    db.session.remove()
+    db.drop_all()
+    ctx.pop()
+
+
+@pytest.fixture()
+def db_transaction(api_app):
+    """
+    Run the test against the session-scoped app, inside a database transaction
+    that gets rolled back afterwards (see :func:`transactional_session`)
+    """
+    with transactional_session() as session:
+        yield session
+
+
+@pytest.fixture()
+def transactional_api_client(api_app, db_transaction):
+    """
+    Like :func:`api_client`, but using the session-scoped app, with the test's
+    database changes rolled back afterwards
+    """
+    with _api_test_client(api_app) as client:
         yield client
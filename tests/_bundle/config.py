@@ -0,0 +1,5 @@
+class TestConfig:
+    TESTING = True
+    SECRET_KEY = 'not-secret'
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
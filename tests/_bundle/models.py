@@ -0,0 +1,27 @@
+import enum
+
+from flask_sqlalchemy_bundle import db
+
+
+class User(db.Model):
+    __tablename__ = 'user'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(64), nullable=False)
+    email = db.Column(db.String(64), nullable=True, unique=True)
+    display_name = db.Column(db.String(64), nullable=True)
+
+
+class ArticleStatus(enum.Enum):
+    DRAFT = 'draft'
+    PUBLISHED = 'published'
+
+
+class Article(db.Model):
+    __tablename__ = 'article'
+
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.Enum(ArticleStatus), nullable=False,
+                       default=ArticleStatus.DRAFT)
+    published_at = db.Column(db.DateTime, nullable=True)
@@ -0,0 +1,17 @@
+from flask_unchained import prefix, resource
+
+from .views import (
+    ArticleResource, PrimaryUserResource, PublishedArticleResource,
+    QueuedUserResource, ReleasingUserResource, UserResource)
+
+
+routes = [
+    prefix('/api', [
+        resource('/users', UserResource),
+        resource('/primary-users', PrimaryUserResource),
+        resource('/queued-users', QueuedUserResource),
+        resource('/releasing-users', ReleasingUserResource),
+        resource('/articles', ArticleResource),
+        resource('/published-articles', PublishedArticleResource),
+    ]),
+]
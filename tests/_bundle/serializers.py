@@ -0,0 +1,13 @@
+from flask_api_bundle import ma
+
+from .models import Article, User
+
+
+class UserSerializer(ma.ModelSerializer):
+    class Meta:
+        model = User
+
+
+class ArticleSerializer(ma.ModelSerializer):
+    class Meta:
+        model = Article
@@ -0,0 +1,41 @@
+from flask_api_bundle import ModelResource
+
+from .models import Article, ArticleStatus, User
+
+
+class UserResource(ModelResource):
+    model = User
+
+
+class PrimaryUserResource(ModelResource):
+    model = User
+    use_read_replicas = False
+
+
+class ReleasingUserResource(ModelResource):
+    model = User
+    release_connections = True
+
+
+class QueuedUserResource(ModelResource):
+    model = User
+    write_behind = True
+
+
+class ArticleResource(ModelResource):
+    model = Article
+    export_formats = ('csv', 'ndjson')
+    export_chunk_size = 2
+
+
+class PublishedArticleResource(ModelResource):
+    model = Article
+    export_formats = ('csv', 'ndjson')
+
+    def list(self, instances):
+        return [article for article in instances
+                if article.status == ArticleStatus.PUBLISHED]
+
+    def get_export_query(self):
+        return super().get_export_query().where(
+            Article.status == ArticleStatus.PUBLISHED)
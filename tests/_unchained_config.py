@@ -0,0 +1,5 @@
+BUNDLES = [
+    'flask_sqlalchemy_bundle',
+    'flask_api_bundle',
+    'tests._bundle',
+]
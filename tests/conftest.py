@@ -0,0 +1,41 @@
+import pytest
+
+from flask_sqlalchemy_bundle import db
+from flask_unchained import AppFactory, TEST
+from unittest import mock
+
+from ._bundle.config import TestConfig
+
+
+def create_app(**config_overrides):
+    """
+    Create an app with the bundles from ``_unchained_config.py``. The config
+    overrides get set on the test bundle's ``TestConfig`` while the app is
+    being created, because that's where the app factory loads config from.
+    """
+    if not config_overrides:
+        return AppFactory.create_app(TEST)
+
+    with mock.patch.multiple(TestConfig, create=True, **config_overrides):
+        return AppFactory.create_app(TEST)
+
+
+@pytest.fixture()
+def app(request):
+    # tests using the rolled back transaction fixtures share the session app
+    if 'api_app' in request.fixturenames:
+        yield request.getfixturevalue('api_app')
+        return
+
+    options = {}
+    for mark in request.node.iter_markers('options'):
+        options.update({k.upper(): v for k, v in mark.kwargs.items()})
+
+    app = create_app(**options)
+    ctx = app.app_context()
+    ctx.push()
+    db.create_all()
+    yield app
+    db.session.remove()
+    db.drop_all()
+    ctx.pop()
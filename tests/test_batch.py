@@ -0,0 +1,116 @@
+import pytest
+import threading
+
+from flask import jsonify, request
+from flask_api_bundle.batch import BatchView
+
+from ._bundle.models import User
+
+
+BATCH_URL = '/api/batch'
+
+
+def user_count():
+    return User.query.count()
+
+
+@pytest.mark.options(api_batch_url=BATCH_URL)
+class TestBatchView:
+    def test_requests_must_be_a_list(self, api_client):
+        r = api_client.post(BATCH_URL, data={'foo': 'bar'})
+        assert r.status_code == 400
+        assert 'requests' in r.errors
+
+    def test_nested_batches_not_allowed(self, api_client):
+        r = api_client.post(BATCH_URL, data=[{'method': 'POST',
+                                              'path': BATCH_URL}])
+        assert r.status_code == 400
+
+    def test_results_are_in_order(self, api_client):
+        r = api_client.post(BATCH_URL, data=[
+            {'method': 'GET', 'path': '/api/users'},
+            {'method': 'POST', 'path': '/api/users', 'body': {'name': 'a'}},
+            {'method': 'GET', 'path': '/api/users'},
+            {'method': 'GET', 'path': '/api/users/1'},
+        ])
+        assert r.status_code == 200
+        assert [result['status'] for result in r.json] == [200, 201, 200, 200]
+        assert r.json[0]['body'] == []
+        assert [u['name'] for u in r.json[2]['body']] == ['a']
+        assert r.json[3]['body']['name'] == 'a'
+
+    def test_reads_run_concurrently(self, api_client, monkeypatch):
+        thread_names = []
+        dispatch_in_app_context = BatchView.dispatch_in_app_context
+
+        def record_thread(self, *args):
+            thread_names.append(threading.current_thread().name)
+            return dispatch_in_app_context(self, *args)
+
+        monkeypatch.setattr(BatchView, 'dispatch_in_app_context',
+                            record_thread)
+        r = api_client.post(BATCH_URL, data=[
+            {'method': 'GET', 'path': '/api/users'} for _ in range(3)])
+        assert [result['status'] for result in r.json] == [200, 200, 200]
+        assert len(thread_names) == 3
+        assert threading.current_thread().name not in thread_names
+
+    @pytest.mark.options(propagate_exceptions=False)
+    def test_server_error_does_not_break_later_requests(self, api_client):
+        r = api_client.post(BATCH_URL, data=[
+            {'method': 'POST', 'path': '/api/users',
+             'body': {'name': 'a', 'email': 'a@example.com'}},
+            {'method': 'POST', 'path': '/api/users',
+             'body': {'name': 'b', 'email': 'a@example.com'}},
+            {'method': 'POST', 'path': '/api/users', 'body': {'name': 'c'}},
+            {'method': 'GET', 'path': '/api/users'},
+        ])
+        assert [result['status'] for result in r.json] == [201, 500, 201, 200]
+        assert [u['name'] for u in r.json[3]['body']] == ['a', 'c']
+
+    def test_transaction_commits(self, api_client):
+        r = api_client.post(BATCH_URL, data={'transaction': True, 'requests': [
+            {'method': 'POST', 'path': '/api/users', 'body': {'name': 'a'}},
+            {'method': 'GET', 'path': '/api/users'},
+            {'method': 'POST', 'path': '/api/users', 'body': {'name': 'b'}},
+        ]})
+        assert [result['status'] for result in r.json] == [201, 200, 201]
+        # reads in a transaction see the earlier (uncommitted) writes
+        assert [u['name'] for u in r.json[1]['body']] == ['a']
+        assert user_count() == 2
+
+    def test_transaction_rolls_back_on_failure(self, api_client):
+        r = api_client.post(BATCH_URL, data={'transaction': True, 'requests': [
+            {'method': 'POST', 'path': '/api/users', 'body': {'name': 'a'}},
+            {'method': 'POST', 'path': '/api/users', 'body': {}},
+            {'method': 'POST', 'path': '/api/users', 'body': {'name': 'c'}},
+        ]})
+        assert [result['status'] for result in r.json] == [424, 400, 424]
+        assert r.json[1]['body']['errors']['name'] == ['Name is required.']
+        assert user_count() == 0
+
+    @pytest.mark.options(api_batch_forwarded_headers=['Authentication-Token'])
+    def test_forwarded_headers(self, app, api_client):
+        app.add_url_rule('/api/echo-headers', 'echo_headers',
+                         lambda: jsonify(dict(request.headers)))
+        r = api_client.post(BATCH_URL, headers={
+            'Authentication-Token': 'token',
+            'Authorization': 'Bearer token',
+        }, data=[{'method': 'GET', 'path': '/api/echo-headers'}])
+        assert r.json[0]['status'] == 200
+        headers = r.json[0]['body']
+        assert headers['Authentication-Token'] == 'token'
+        assert 'Authorization' not in headers
+
+    def test_auth_headers_forwarded_by_default(self, app, api_client):
+        app.add_url_rule('/api/echo-headers', 'echo_headers',
+                         lambda: jsonify(dict(request.headers)))
+        r = api_client.post(BATCH_URL, headers={
+            'Authentication-Token': 'token',
+            'Authorization': 'Bearer token',
+            'X-Not-Forwarded': 'foo',
+        }, data=[{'method': 'GET', 'path': '/api/echo-headers'}])
+        headers = r.json[0]['body']
+        assert headers['Authentication-Token'] == 'token'
+        assert headers['Authorization'] == 'Bearer token'
+        assert 'X-Not-Forwarded' not in headers
@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+import pytest
+
+from datetime import datetime
+from flask_sqlalchemy_bundle import db
+
+from flask_api_bundle import ModelResource
+from flask_api_bundle.export import ModelExporter
+
+from ._bundle.models import Article, ArticleStatus
+from ._bundle.serializers import ArticleSerializer
+
+
+ARTICLES_URL = '/api/articles'
+PUBLISHED_ARTICLES_URL = '/api/published-articles'
+PUBLISHED_AT = datetime(2018, 1, 2, 3, 4, 5)
+
+
+@pytest.fixture()
+def articles(app):
+    articles = [Article(title=f'article {i}', status=ArticleStatus.DRAFT)
+                for i in range(4)]
+    articles.append(Article(title='published', published_at=PUBLISHED_AT,
+                            status=ArticleStatus.PUBLISHED))
+    db.session.add_all(articles)
+    db.session.commit()
+    return articles
+
+
+@pytest.fixture()
+def client(app):
+    # a plain client, because ApiTestClient always sends Accept: json
+    with app.test_client() as client:
+        yield client
+
+
+def export(client, url, mimetype):
+    r = client.get(url, headers={'Accept': mimetype})
+    assert r.status_code == 200
+    assert r.mimetype == mimetype
+    return r.get_data(as_text=True)
+
+
+def read_csv(data):
+    return list(csv.DictReader(io.StringIO(data)))
+
+
+def read_ndjson(data):
+    return [json.loads(line) for line in data.splitlines()]
+
+
+class TestExport:
+    def test_csv(self, client, articles):
+        rows = read_csv(export(client, ARTICLES_URL, 'text/csv'))
+        assert [row['title'] for row in rows] == [a.title for a in articles]
+
+        # the header row uses the camel-cased keys of the serializer
+        assert 'publishedAt' in rows[0]
+        assert 'published_at' not in rows[0]
+
+        assert rows[0]['status'] == 'DRAFT'
+        assert rows[0]['publishedAt'] == ''
+        assert rows[-1]['status'] == 'PUBLISHED'
+        assert rows[-1]['publishedAt'] == '2018-01-02T03:04:05+00:00'
+
+    def test_ndjson(self, client, articles):
+        rows = read_ndjson(export(client, ARTICLES_URL, 'application/x-ndjson'))
+        assert [row['title'] for row in rows] == [a.title for a in articles]
+        assert rows[0]['status'] == 'DRAFT'
+        assert rows[0]['publishedAt'] is None
+        assert rows[-1]['status'] == 'PUBLISHED'
+        assert rows[-1]['publishedAt'] == '2018-01-02T03:04:05+00:00'
+
+    def test_matches_list_view(self, client, articles):
+        r = client.get(ARTICLES_URL, headers={'Accept': 'application/json'})
+        rows = read_ndjson(export(client, ARTICLES_URL, 'application/x-ndjson'))
+        assert rows == r.get_json()
+
+    def test_chunked(self, client, articles, monkeypatch):
+        chunk_sizes = []
+        ndjson_chunk = ModelExporter._ndjson_chunk
+
+        def record_chunk(self, rows):
+            chunk_sizes.append(len(rows))
+            return ndjson_chunk(self, rows)
+
+        monkeypatch.setattr(ModelExporter, '_ndjson_chunk', record_chunk)
+        export(client, ARTICLES_URL, 'application/x-ndjson')
+        assert chunk_sizes == [2, 2, 1]  # export_chunk_size = 2
+
+    @pytest.mark.parametrize('accept', [None, '*/*', 'application/json',
+                                        'application/json, text/csv'])
+    def test_json_gets_list_view(self, client, articles, accept):
+        headers = {'Accept': accept} if accept else {}
+        r = client.get(ARTICLES_URL, headers=headers)
+        assert r.status_code == 200
+        assert r.mimetype == 'application/json'
+        assert len(r.get_json()) == len(articles)
+
+    def test_export_query_scopes_rows(self, client, articles):
+        r = client.get(PUBLISHED_ARTICLES_URL,
+                       headers={'Accept': 'application/json'})
+        assert [a['title'] for a in r.get_json()] == ['published']
+
+        for mimetype, read in [('text/csv', read_csv),
+                               ('application/x-ndjson', read_ndjson)]:
+            rows = read(export(client, PUBLISHED_ARTICLES_URL, mimetype))
+            assert [row['title'] for row in rows] == ['published']
+
+    def test_warns_when_list_scoped_but_export_not(self, app):
+        class LeakyArticleResource(ModelResource):
+            model = Article
+            serializer_many = ArticleSerializer(many=True)
+            export_formats = ('csv',)
+
+            def list(self, instances):
+                return instances[:1]
+
+        with pytest.warns(UserWarning, match='get_export_query'):
+            LeakyArticleResource().get_exporter()
@@ -0,0 +1,140 @@
+import json
+import pytest
+import threading
+import time
+
+from flask_api_bundle.extensions import idempotency
+from flask_api_bundle.idempotency import MemoryIdempotencyStore
+
+from ._bundle.models import User
+
+
+USERS_URL = '/api/users'
+KEY_HEADERS = {'Idempotency-Key': 'abc123'}
+
+
+def request_key_and_fingerprint(app, data, headers=KEY_HEADERS):
+    with app.test_request_context(
+            USERS_URL, method='POST', headers=headers,
+            data=json.dumps(data, separators=(',', ':'))):
+        return idempotency.get_key(), idempotency.get_fingerprint()
+
+
+class TestMemoryIdempotencyStore:
+    def test_values_expire(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+        store = MemoryIdempotencyStore()
+        store.set('key', 'value', 10)
+        assert store.get('key') == 'value'
+
+        now[0] = 111.0
+        assert store.get('key') is None
+
+    def test_oldest_values_evicted(self):
+        store = MemoryIdempotencyStore(max_keys=2)
+        store.set('a', 1, 60)
+        store.set('b', 2, 60)
+        store.set('a', 3, 60)
+        store.set('c', 4, 60)
+        assert store.get('b') is None
+        assert store.get('a') == 3
+        assert store.get('c') == 4
+
+    def test_acquire_release_wait(self):
+        store = MemoryIdempotencyStore()
+        assert store.acquire('key')
+        assert not store.acquire('key')
+        assert not store.wait('key', 0.01)
+
+        store.release('key')
+        assert store.wait('key', 0.01)
+        assert store.acquire('key')
+
+
+class TestIdempotency:
+    def test_response_replayed(self, api_client):
+        r1 = api_client.post(USERS_URL, data={'name': 'a'},
+                             headers=KEY_HEADERS)
+        assert r1.status_code == 201
+
+        r2 = api_client.post(USERS_URL, data={'name': 'a'},
+                             headers=KEY_HEADERS)
+        assert r2.status_code == 201
+        assert r2.json == r1.json
+        assert User.query.count() == 1
+
+    def test_different_body_rejected(self, api_client):
+        r = api_client.post(USERS_URL, data={'name': 'a'},
+                            headers=KEY_HEADERS)
+        assert r.status_code == 201
+
+        r = api_client.post(USERS_URL, data={'name': 'b'},
+                            headers=KEY_HEADERS)
+        assert r.status_code == 422
+        assert '_schema' in r.errors
+        assert User.query.count() == 1
+
+    def test_keys_scoped_per_caller(self, api_client):
+        r1 = api_client.post(USERS_URL, data={'name': 'a'}, headers={
+            **KEY_HEADERS, 'Authorization': 'Bearer one'})
+        assert r1.status_code == 201
+
+        r2 = api_client.post(USERS_URL, data={'name': 'a'}, headers={
+            **KEY_HEADERS, 'Authorization': 'Bearer two'})
+        assert r2.status_code == 201
+        assert r2.json['id'] != r1.json['id']
+        assert User.query.count() == 2
+
+    def test_cookies_not_replayed(self, app):
+        def view():
+            response = app.response_class('{}', 201,
+                                          mimetype='application/json')
+            response.set_cookie('session', 'secret')
+            response.headers['Connection'] = 'keep-alive'
+            return response
+
+        with app.test_request_context(USERS_URL, method='POST', data='{}',
+                                      headers=KEY_HEADERS):
+            key = idempotency.get_key()
+            assert 'Set-Cookie' in idempotency.run(key, view).headers
+            replayed = idempotency.run(key, view)
+
+        assert replayed.status_code == 201
+        assert replayed.mimetype == 'application/json'
+        assert 'Set-Cookie' not in replayed.headers
+        assert 'Connection' not in replayed.headers
+
+    @pytest.mark.options(api_idempotency_wait_timeout=0.01)
+    def test_conflict_while_in_flight(self, app, api_client):
+        key, _ = request_key_and_fingerprint(app, {'name': 'a'})
+        idempotency.store.acquire(key)
+        try:
+            r = api_client.post(USERS_URL, data={'name': 'a'},
+                                headers=KEY_HEADERS)
+        finally:
+            idempotency.store.release(key)
+        assert r.status_code == 409
+        assert User.query.count() == 0
+
+    def test_waits_for_in_flight_request(self, app, api_client):
+        key, fingerprint = request_key_and_fingerprint(app, {'name': 'a'})
+        idempotency.store.acquire(key)
+
+        responses = []
+        thread = threading.Thread(target=lambda: responses.append(
+            api_client.post(USERS_URL, data={'name': 'a'},
+                            headers=KEY_HEADERS)))
+        thread.start()
+        time.sleep(0.05)
+
+        # finish the "in-flight" request
+        idempotency.store.set(key, (fingerprint, b'{"id":1,"name":"a"}', 201,
+                                    [('Content-Type', 'application/json')]),
+                              idempotency.ttl)
+        idempotency.store.release(key)
+        thread.join(1)
+
+        assert responses[0].status_code == 201
+        assert responses[0].json == {'id': 1, 'name': 'a'}
+        assert User.query.count() == 0
@@ -0,0 +1,75 @@
+import pytest
+
+from flask_sqlalchemy_bundle import db
+from marshmallow import fields
+
+from ._bundle.models import User
+from ._bundle.serializers import UserSerializer
+
+
+@pytest.fixture()
+def validate_calls(app, monkeypatch):
+    calls = []
+
+    def validate(cls, **kwargs):
+        calls.append(kwargs)
+        if kwargs.get('display_name') == 'bad':
+            raise db.ValidationErrors({'display_name': ['Bad display name.']})
+
+    monkeypatch.setattr(User, '__validators__', {'display_name': [object()]},
+                        raising=False)
+    monkeypatch.setattr(User, 'validate', classmethod(validate))
+    # the plans are cached per serializer class
+    monkeypatch.setattr(UserSerializer, '_validation_plans', {},
+                        raising=False)
+    return calls
+
+
+class TestValidationPlan:
+    def test_validators_looked_up_by_attribute_name(self, validate_calls):
+        result = UserSerializer().load({'name': 'a', 'displayName': 'ok'})
+        assert not result.errors
+        assert validate_calls == [{'display_name': 'ok'}]
+
+    def test_errors_reported_under_request_keys(self, validate_calls):
+        result = UserSerializer().load({'name': 'a', 'displayName': 'bad'})
+        assert result.errors == {'displayName': ['Bad display name.']}
+
+        result = UserSerializer().load({'name': 'a', 'display_name': 'bad'})
+        assert result.errors == {'display_name': ['Bad display name.']}
+
+    def test_errors_merged_with_marshmallow_errors(self, validate_calls):
+        result = UserSerializer().load({'displayName': 'bad'})
+        assert result.errors == {'name': ['Name is required.'],
+                                 'displayName': ['Bad display name.']}
+
+    def test_skipped_without_validated_keys(self, validate_calls):
+        result = UserSerializer().load({'name': 'a', 'email': 'a@b.c'},
+                                       partial=True)
+        assert not result.errors
+        assert validate_calls == []
+
+
+class NullableNameSerializer(UserSerializer):
+    # so that marshmallow lets null through, leaving it to the model
+    name = fields.String(allow_none=True)
+
+
+class TestModelValidators:
+    """
+    Using the real validators of the model (name isn't nullable)
+    """
+    def test_partial_load_validates_present_fields(self, app):
+        result = NullableNameSerializer().load({'name': None}, partial=True)
+        assert set(result.errors) == {'name'}
+
+    def test_partial_load_skips_missing_fields(self, app):
+        result = NullableNameSerializer().load({'email': 'a@example.com'},
+                                               partial=True)
+        assert not result.errors
+
+    def test_plan_uses_attribute_names(self, app):
+        serializer = NullableNameSerializer()
+        serializer.load({}, partial=True)
+        plan = serializer._get_validation_plan()
+        assert plan['name'] == 'name'
@@ -0,0 +1,138 @@
+import json
+import pytest
+
+from marshmallow import Schema, fields
+
+from flask_api_bundle.commands import write_openapi
+from flask_api_bundle.openapi import (
+    RequestValidator, build_openapi_spec, field_to_property)
+
+
+OPENAPI_URL = '/api/openapi.json'
+
+
+class ChildSchema(Schema):
+    name = fields.String(required=True)
+
+
+class ParentSchema(Schema):
+    first_name = fields.String(required=True, load_from='firstName')
+    age = fields.Integer(allow_none=True)
+    tags = fields.List(fields.String())
+    children = fields.Nested(ChildSchema, many=True)
+    created_at = fields.DateTime(dump_only=True, load_from='createdAt')
+
+
+def test_nested_many_is_an_array():
+    prop = field_to_property(ParentSchema().fields['children'])
+    assert prop['type'] == 'array'
+
+
+@pytest.mark.parametrize('data', [
+    None,
+    [],
+    {},
+    {'firstName': 'a'},
+    {'first_name': 'a'},
+    {'firstName': None},
+    {'firstName': 1},
+    {'firstName': 'a', 'age': None},
+    {'firstName': 'a', 'age': '42'},
+    {'firstName': 'a', 'age': [42]},
+    {'firstName': 'a', 'tags': ['x', 'y']},
+    {'firstName': 'a', 'tags': 'x'},
+    {'firstName': 'a', 'children': [{'name': 'b'}]},
+    {'firstName': 'a', 'children': {'name': 'b'}},
+    {'firstName': 'a', 'createdAt': 1},
+])
+def test_fast_path_matches_marshmallow(data):
+    serializer = ParentSchema()
+    fast_errors = RequestValidator(serializer).validate(data)
+    errors = serializer.load({} if data is None else data).errors
+
+    # the fast path may catch fewer errors than marshmallow, but it must never
+    # reject data that marshmallow accepts, nor report errors under other keys
+    if not errors:
+        assert not fast_errors
+    assert set(fast_errors) <= set(errors)
+
+
+@pytest.mark.parametrize('data', [{}, {'age': 'x'}, {'first_name': None}])
+def test_fast_path_partial(data):
+    serializer = ParentSchema()
+    fast_errors = RequestValidator(serializer).validate(data, partial=True)
+    errors = serializer.load(data, partial=True).errors
+    if not errors:
+        assert not fast_errors
+    assert set(fast_errors) <= set(errors)
+
+
+class TestBuildOpenapiSpec:
+    def test_paths(self, app):
+        paths = build_openapi_spec(app)['paths']
+        assert set(paths['/api/users']) == {'get', 'post'}
+        assert set(paths['/api/users/{id}']) == {'get', 'patch', 'put',
+                                                 'delete'}
+        assert '/api/primary-users' in paths
+
+    def test_path_parameters(self, app):
+        operation = build_openapi_spec(app)['paths']['/api/users/{id}']['get']
+        assert operation['parameters'] == [{'name': 'id', 'in': 'path',
+                                            'required': True,
+                                            'schema': {'type': 'integer'}}]
+        assert '404' in operation['responses']
+
+    def test_component_schemas(self, app):
+        spec = build_openapi_spec(app)
+        schema = spec['components']['schemas']['UserSerializer']
+        assert schema['type'] == 'object'
+        assert schema['required'] == ['name']
+        # camel-cased, like the serializer dumps and loads
+        assert 'displayName' in schema['properties']
+        assert 'display_name' not in schema['properties']
+
+        list_response = spec['paths']['/api/users']['get']['responses']['200']
+        assert list_response['content']['application/json']['schema'] == {
+            'type': 'array',
+            'items': {'$ref': '#/components/schemas/UserSerializer'}}
+
+    def test_patch_request_body_is_partial(self, app):
+        spec = build_openapi_spec(app)
+        operations = spec['paths']['/api/users/{id}']
+
+        def request_schema(method):
+            body = operations[method]['requestBody']
+            return body['content']['application/json']['schema']
+
+        assert request_schema('put') == {
+            '$ref': '#/components/schemas/UserSerializer'}
+        assert request_schema('patch') == {
+            '$ref': '#/components/schemas/UserSerializerPartial'}
+
+        partial = spec['components']['schemas']['UserSerializerPartial']
+        assert 'required' not in partial
+        assert 'displayName' in partial['properties']
+
+
+@pytest.mark.options(api_openapi_url=OPENAPI_URL)
+def test_view_is_conditional(api_client):
+    r = api_client.get(OPENAPI_URL)
+    assert r.status_code == 200
+    assert r.json['openapi'] == '3.0.0'
+    assert '/api/users' in r.json['paths']
+
+    etag = r.headers['ETag']
+    r = api_client.get(OPENAPI_URL, headers={'If-None-Match': etag})
+    assert r.status_code == 304
+
+
+def test_openapi_command(app, cli_runner, tmp_path):
+    path = tmp_path / 'openapi.json'
+    result = cli_runner.invoke(write_openapi, [str(path), '--indent', '4'])
+    assert result.exit_code == 0, result.output
+    assert str(path) in result.output
+
+    with open(path) as f:
+        contents = f.read()
+    assert contents.startswith('{\n    "openapi"')
+    assert json.loads(contents) == build_openapi_spec(app)
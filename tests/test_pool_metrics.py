@@ -0,0 +1,46 @@
+import pytest
+
+from flask_sqlalchemy_bundle import db
+
+from flask_api_bundle.extensions import pool_metrics
+
+
+enabled = pytest.mark.options(api_pool_metrics=True,
+                              api_pool_metrics_url='/api/pool-metrics')
+
+
+@enabled
+def test_snapshot(api_client):
+    before = pool_metrics.snapshot()['default']
+    assert api_client.get('/api/users').status_code == 200
+
+    after = pool_metrics.snapshot()['default']
+    assert after['checkouts'] > before['checkouts']
+    assert after['total_wait'] > before['total_wait']
+    assert after['max_wait'] >= after['avg_wait'] > 0
+
+
+@enabled
+def test_view(api_client):
+    api_client.get('/api/users')
+    r = api_client.get('/api/pool-metrics')
+    assert r.status_code == 200
+    assert r.json['default']['checkouts'] > 0
+    assert set(r.json['default']) >= {
+        'checkouts', 'total_wait', 'max_wait', 'avg_wait'}
+
+
+@enabled
+def test_still_timed_after_dispose(api_client):
+    db.session.remove()
+    db.engine.dispose()
+    db.create_all()  # the new pool's in-memory database starts out empty
+    checkouts = pool_metrics.snapshot()['default']['checkouts']
+
+    assert api_client.get('/api/users').status_code == 200
+    assert pool_metrics.snapshot()['default']['checkouts'] > checkouts
+
+
+def test_disabled(api_client):
+    assert pool_metrics.snapshot() == {}
+    assert api_client.get('/api/pool-metrics').status_code == 404
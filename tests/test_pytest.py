@@ -0,0 +1,56 @@
+from flask_api_bundle.pytest import (
+    ApiTestClient, _api_test_client, seed_models, transactional_session,
+    worker_database_uri)
+
+from ._bundle.models import User
+
+
+class TestWorkerDatabaseUri:
+    def test_no_worker(self, monkeypatch):
+        monkeypatch.delenv('PYTEST_XDIST_WORKER', raising=False)
+        assert worker_database_uri('sqlite:///test.db') == 'sqlite:///test.db'
+
+    def test_worker(self, monkeypatch):
+        monkeypatch.setenv('PYTEST_XDIST_WORKER', 'gw1')
+        assert worker_database_uri('sqlite:///test.db') == \
+            'sqlite:///test_gw1.db'
+        assert worker_database_uri('postgresql://u@localhost/db?x=1') == \
+            'postgresql://u@localhost/db_gw1?x=1'
+        assert worker_database_uri('sqlite://') == 'sqlite://'
+
+
+class TestApiTestClient:
+    def test_headers_not_mutated(self, app):
+        headers = {'X-Foo': 'bar'}
+        with _api_test_client(app) as client:
+            assert isinstance(client, ApiTestClient)
+            r = client.get('/api/users', headers=headers)
+        assert r.status_code == 200
+        assert r.json == []
+        assert headers == {'X-Foo': 'bar'}
+
+
+class TestDbTransaction:
+    def test_changes_rolled_back(self, api_app):
+        with transactional_session() as session:
+            with _api_test_client(api_app) as client:
+                r = client.post('/api/users', data={'name': 'a'})
+            assert r.status_code == 201
+            session.add(User(name='b'))
+            session.commit()
+            assert User.query.count() == 2
+
+        with transactional_session():
+            assert User.query.count() == 0
+
+    def test_rollback_in_test(self, db_transaction):
+        db_transaction.add(User(name='a'))
+        db_transaction.commit()
+        db_transaction.add(User(name='b'))
+        db_transaction.rollback()
+        assert [u.name for u in User.query.all()] == ['a']
+
+    def test_seed_models(self, db_transaction):
+        seed_models(User, [{'name': f'user{i}'} for i in range(100)])
+        assert User.query.count() == 100
+
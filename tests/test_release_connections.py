@@ -0,0 +1,83 @@
+import pytest
+
+from flask import jsonify
+from flask_sqlalchemy_bundle import db
+from sqlalchemy import event
+
+from flask_api_bundle import model_resource
+
+from ._bundle.models import User
+
+
+RELEASING_USERS_URL = '/api/releasing-users'
+
+
+@pytest.fixture()
+def checked_out(app):
+    """
+    Keep count of the connections currently checked out of the pool
+    """
+    count = {'connections': 0}
+
+    def checkout(*args):
+        count['connections'] += 1
+
+    def checkin(*args):
+        count['connections'] -= 1
+
+    event.listen(db.engine, 'checkout', checkout)
+    event.listen(db.engine, 'checkin', checkin)
+    yield count
+    event.remove(db.engine, 'checkout', checkout)
+    event.remove(db.engine, 'checkin', checkin)
+
+
+@pytest.fixture()
+def encoded_while(checked_out, monkeypatch):
+    """
+    Record the number of connections checked out when each response body
+    gets encoded
+    """
+    counts = []
+
+    def record_jsonify(*args, **kwargs):
+        counts.append(checked_out['connections'])
+        return jsonify(*args, **kwargs)
+
+    monkeypatch.setattr(model_resource, 'jsonify', record_jsonify)
+    return counts
+
+
+@pytest.fixture()
+def user(app):
+    user = User(name='user')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_released_before_encoding(api_client, encoded_while, user):
+    assert api_client.get(RELEASING_USERS_URL).status_code == 200
+    assert api_client.get(f'{RELEASING_USERS_URL}/1').status_code == 200
+    assert api_client.post(RELEASING_USERS_URL,
+                           data={'name': 'new'}).status_code == 201
+    assert encoded_while == [0, 0, 0]
+
+
+def test_held_by_default(api_client, encoded_while, user):
+    assert api_client.get('/api/users/1').status_code == 200
+    assert encoded_while == [1]
+
+
+def test_instances_usable_after_release(app, api_client, user):
+    names = []
+
+    @app.after_request
+    def use_instance(response):
+        names.append(user.name)
+        return response
+
+    r = api_client.get(f'{RELEASING_USERS_URL}/1')
+    assert r.json['name'] == 'user'
+    assert names == ['user']
+
@@ -0,0 +1,70 @@
+import pytest
+import time
+
+from flask_sqlalchemy_bundle import db
+
+from ._bundle.models import User
+from .conftest import create_app
+
+
+@pytest.fixture()
+def app(tmp_path):
+    app = create_app(
+        SQLALCHEMY_DATABASE_URI=f'sqlite:///{tmp_path}/primary.db',
+        SQLALCHEMY_BINDS={'replica': f'sqlite:///{tmp_path}/replica.db'},
+        API_READ_REPLICA_BINDS=['replica'],
+        API_BATCH_URL='/api/batch')
+    ctx = app.app_context()
+    ctx.push()
+    db.create_all()
+    replica = db.get_engine(app, bind='replica')
+    db.Model.metadata.create_all(replica)
+
+    # seed each database with different data, to tell where reads went
+    db.session.add(User(name='primary'))
+    db.session.commit()
+    replica.execute(User.__table__.insert(), name='replica')
+
+    yield app
+    db.session.remove()
+    ctx.pop()
+
+
+def names(r):
+    return [user['name'] for user in r.json]
+
+
+def test_list_and_get_use_replica(api_client):
+    assert names(api_client.get('/api/users')) == ['replica']
+    assert api_client.get('/api/users/1').json['name'] == 'replica'
+
+
+def test_opt_out_uses_primary(api_client):
+    assert names(api_client.get('/api/primary-users')) == ['primary']
+    assert api_client.get('/api/primary-users/1').json['name'] == 'primary'
+
+
+def test_read_your_writes(app, api_client):
+    r = api_client.post('/api/users', data={'name': 'new'})
+    assert r.status_code == 201
+    cookie_name = app.config['API_READ_YOUR_WRITES_COOKIE']
+    assert cookie_name in r.headers['Set-Cookie']
+
+    # within the window, reads stay on the primary
+    assert names(api_client.get('/api/users')) == ['primary', 'new']
+
+    # once the window has passed, reads go back to the replica
+    api_client.set_cookie('localhost', cookie_name, str(time.time() - 60))
+    assert names(api_client.get('/api/users')) == ['replica']
+
+
+def test_read_your_writes_in_batch(app, api_client):
+    r = api_client.post('/api/batch', data=[
+        {'method': 'POST', 'path': '/api/users', 'body': {'name': 'new'}},
+        {'method': 'GET', 'path': '/api/users'},
+        {'method': 'GET', 'path': '/api/users/1'},
+    ])
+    assert [result['status'] for result in r.json] == [201, 200, 200]
+    assert [u['name'] for u in r.json[1]['body']] == ['primary', 'new']
+    assert r.json[2]['body']['name'] == 'primary'
+    assert app.config['API_READ_YOUR_WRITES_COOKIE'] in r.headers['Set-Cookie']
@@ -0,0 +1,116 @@
+import pytest
+
+from flask_api_bundle.extensions import write_behind
+from flask_api_bundle.extensions.write_behind import WriteBehind
+
+from ._bundle.models import User
+
+
+QUEUED_USERS_URL = '/api/queued-users'
+
+
+@pytest.fixture(autouse=True)
+def shutdown(app):
+    yield
+    write_behind.shutdown()
+
+
+@pytest.fixture()
+def no_worker(monkeypatch):
+    """
+    Keep the worker from starting, so that writes stay queued until shutdown
+    """
+    monkeypatch.setattr(WriteBehind, '_ensure_worker', lambda self: None)
+
+
+@pytest.fixture()
+def flushes(monkeypatch):
+    """
+    Record the number of instances saved by each grouped flush
+    """
+    sizes = []
+    flush = WriteBehind._flush
+
+    def record_flush(self, items):
+        sizes.append(len(items))
+        return flush(self, items)
+
+    monkeypatch.setattr(WriteBehind, '_flush', record_flush)
+    return sizes
+
+
+def queue_users(api_client, *data):
+    responses = [api_client.post(QUEUED_USERS_URL, data=d) for d in data]
+    assert [r.status_code for r in responses] == [202] * len(data)
+    return [r.json['handle'] for r in responses]
+
+
+def test_create_is_accepted(api_client):
+    r = api_client.post(QUEUED_USERS_URL, data={'name': 'a'})
+    assert r.status_code == 202
+    assert r.json['status'] == 'pending'
+    assert r.headers['Location'].endswith(
+        f'/api/write-behind/{r.json["handle"]}')
+
+    write_behind.shutdown()
+    assert write_behind.get_status(r.json['handle'])['status'] == 'done'
+    assert [u.name for u in User.query.all()] == ['a']
+
+
+def test_status_view(api_client):
+    handle, = queue_users(api_client, {'name': 'a'})
+    write_behind.shutdown()
+
+    r = api_client.get(f'/api/write-behind/{handle}')
+    assert r.status_code == 200
+    assert r.json == {'status': 'done', 'id': User.query.one().id}
+
+    r = api_client.get('/api/write-behind/unknown')
+    assert r.status_code == 404
+
+
+@pytest.mark.options(api_write_behind_queue_size=1)
+def test_full_queue(api_client, no_worker):
+    queue_users(api_client, {'name': 'a'})
+
+    r = api_client.post(QUEUED_USERS_URL, data={'name': 'b'})
+    assert r.status_code == 503
+    assert r.headers['Retry-After'] == '1'
+    assert r.errors['_schema'] == ['Too many pending writes.']
+
+
+def test_writes_flushed_in_groups(api_client, no_worker, flushes):
+    handles = queue_users(api_client, *[{'name': n} for n in 'abc'])
+    assert User.query.count() == 0
+
+    write_behind.shutdown()
+    assert flushes == [3]
+    assert [write_behind.get_status(h)['status'] for h in handles] == \
+        ['done'] * 3
+    assert User.query.count() == 3
+
+
+def test_failed_group_retried_one_by_one(api_client, no_worker, flushes):
+    handles = queue_users(api_client,
+                          {'name': 'a', 'email': 'a@example.com'},
+                          {'name': 'b', 'email': 'a@example.com'},
+                          {'name': 'c'})
+    write_behind.shutdown()
+
+    assert flushes == [3, 1, 1, 1]
+    assert [write_behind.get_status(h)['status'] for h in handles] == \
+        ['done', 'failed', 'done']
+    assert sorted(u.name for u in User.query.all()) == ['a', 'c']
+
+
+def test_rejected_after_shutdown(app, api_client):
+    write_behind.shutdown()
+    r = api_client.post(QUEUED_USERS_URL, data={'name': 'a'})
+    assert r.status_code == 503
+    assert r.errors['_schema'] == ['The server is shutting down.']
+
+    # until the extension gets initialized again
+    write_behind.init_app(app)
+    queue_users(api_client, {'name': 'a'})
+    write_behind.shutdown()
+    assert User.query.count() == 1